@@ -0,0 +1,73 @@
+"""Import-time benchmark of kabupy.
+
+Every statement runs in a fresh interpreter, so the timings are those of a cold start.
+
+Usage::
+
+    python benchmarks/bench_import.py [--repeat 10] [--output import.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import kabupy": "import kabupy",
+    "kabupy.Kabuyoho": "import kabupy; kabupy.Kabuyoho",
+    "kabupy.kabuyoho": "import kabupy; kabupy.kabuyoho",
+    "kabupy.jpx": "import kabupy; kabupy.jpx",
+}
+"""Statements to time, by name."""
+
+HEAVY_MODULES = ("bs4", "money", "numpy", "pandas", "requests")
+"""Third-party modules whose import dominates the cold start."""
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, repeat: int) -> dict:
+    """Time a statement in fresh interpreters and return the summary."""
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    script = SCRIPT.format(statement=statement, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True)
+        runs.append(json.loads(output.stdout))
+    seconds = [run["seconds"] for run in runs]
+    return {
+        "median": statistics.median(seconds),
+        "min": min(seconds),
+        "max": max(seconds),
+        "repeat": repeat,
+        "heavy_modules": runs[0]["modules"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="number of interpreters per statement")
+    parser.add_argument("--output", help="file to write the JSON results to, stdout if omitted")
+    args = parser.parse_args()
+    results = {name: measure(statement, args.repeat) for name, statement in STATEMENTS.items()}
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
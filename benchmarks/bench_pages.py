@@ -0,0 +1,221 @@
+"""Benchmark of the page parsers over the HTML fixtures of the tests.
+
+For every page class it measures the time to load a page from its HTML, the time of each webpage property,
+the time of a full snapshot (all properties), and the peak memory of a load and a snapshot.
+Synthetically scaled news pages measure how the news parsers scale with the number of items.
+
+Usage::
+
+    python benchmarks/bench_pages.py [--repeat 20] [--output results.json]
+    python benchmarks/bench_pages.py --compare baseline.json [--threshold 0.2]
+
+In compare mode, the exit status is 1 if any best timing or peak memory is worse than the baseline by more than
+the threshold ratio.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+from kabupy import Jpx, Kabuyoho  # noqa: E402
+from kabupy.base import Webpage  # noqa: E402
+from kabupy.kabuyoho.report_dps import ReportDps  # noqa: E402
+from kabupy.kabuyoho.report_news import KabuyohoNewsWebpage  # noqa: E402
+from kabupy.kabuyoho.report_target import ReportTarget  # noqa: E402
+from kabupy.kabuyoho.report_top import ReportTop  # noqa: E402
+from kabupy.kabuyoho.report_trend_signal import ReportTrendSignal  # noqa: E402
+from kabupy.transport import Request, Response, Transport  # noqa: E402
+
+KABUYOHO_HTML = os.path.join(ROOT, "tests", "kabuyoho", "html")
+JPX_DIR = os.path.join(ROOT, "tests", "jpx")
+CODES = ("6758", "7837")
+PAGES: dict[str, tuple[type[Webpage], str]] = {
+    "ReportTop": (ReportTop, "reportTop"),
+    "ReportTarget": (ReportTarget, "reportTarget"),
+    "ReportDps": (ReportDps, "reportDps"),
+    "ReportTrendSignal": (ReportTrendSignal, "reportTrendSignal"),
+}
+"""Page classes with the fixture directory of their HTML, by name."""
+NEWS_SCALES = (1, 10, 100)
+"""Factors the items of the news fixture are multiplied by."""
+
+
+class FixtureTransport(Transport):
+    """Transport serving fixed bodies by url."""
+
+    def __init__(self, bodies: dict[str, bytes]) -> None:
+        self.bodies = bodies
+
+    def send(self, request: Request) -> Response:
+        return Response(request.url, 200, self.bodies[request.url], encoding="utf-8")
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def timeit(func: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> dict[str, float]:
+    """Time func over repeat runs. setup runs before every run and is not timed; its result is passed to func."""
+    seconds = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg) if setup is not None else func()  # pylint: disable=expression-not-assigned
+        seconds.append(time.perf_counter() - start)
+    return {"median": statistics.median(seconds), "min": min(seconds)}
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Peak bytes allocated while running func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def kabuyoho_for(bodies: dict[str, bytes]) -> Kabuyoho:
+    return Kabuyoho(FixtureTransport(bodies), middlewares=[])
+
+
+def bench_page(name: str, cls: type[Webpage], directory: str, repeat: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for code in CODES:
+        path = os.path.join(KABUYOHO_HTML, directory, f"{code}.html")
+        if not os.path.exists(path):
+            continue
+        website = kabuyoho_for({f"https://kabuyoho.jp/sp/{directory}?bcode={code}": read(path)})
+        key = f"{name}/{code}"
+
+        def load(website=website, code=code):
+            return cls(website, code)  # type: ignore[call-arg]
+
+        def fresh(page=load()):
+            page.values = {}
+            return page
+
+        results[f"{key}/load"] = timeit(load, repeat)
+        results[f"{key}/snapshot"] = timeit(lambda page: page.extract(), repeat, fresh)
+        for prop in cls.webpage_properties():
+            results[f"{key}/property/{prop}"] = timeit(lambda page, prop=prop: _get(page, prop), repeat, fresh)
+        results[f"{key}/peak_memory"] = {"bytes": peak_memory(lambda: load().extract())}
+    return results
+
+
+def _get(page: Webpage, prop: str) -> None:
+    try:
+        getattr(page, prop)
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def scale_news(html: bytes, factor: int) -> bytes:
+    """Multiply the items of the news list of a news page."""
+    text = html.decode("utf-8")
+    match = re.search(r"(<div class=\"sp_news_list\">\s*<ul>)(.*?)(</ul>)", text, re.S)
+    if match is None:
+        raise ValueError("news list is not found")
+    items = match.group(2) * factor
+    return (text[: match.start(2)] + items + text[match.end(2) :]).encode("utf-8")
+
+
+def bench_news(repeat: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    html = read(os.path.join(KABUYOHO_HTML, "reportNews", "analyst_evaluation", "6758.html"))
+    for factor in NEWS_SCALES:
+        url = "https://kabuyoho.jp/sp/reportNews?bcode=6758&cat=4"
+        website = kabuyoho_for({url: scale_news(html, factor)})
+        key = f"KabuyohoNewsWebpage/x{factor}"
+
+        def load(website=website):
+            return KabuyohoNewsWebpage(website, "6758", 4)
+
+        page = load()
+        results[f"{key}/load"] = timeit(load, repeat)
+        results[f"{key}/get_link_records"] = timeit(lambda page=page: page.get_link_records(), repeat)
+        results[f"{key}/get_links_frame"] = timeit(lambda page=page: page.get_links_frame(), repeat)
+        results[f"{key}/peak_memory"] = {"bytes": peak_memory(lambda: load().get_link_records())}
+    return results
+
+
+def bench_jpx(repeat: int) -> dict[str, Any]:
+    html_url = "https://www.jpx.co.jp/markets/statistics-equities/misc/01.html"
+    bodies = {html_url: read(os.path.join(JPX_DIR, "html", "issues.html"))}
+    link = Jpx(FixtureTransport(bodies), middlewares=[]).issues_link
+    bodies[link] = read(os.path.join(JPX_DIR, "excel", "issues.xls"))
+
+    def new():
+        return Jpx(FixtureTransport(bodies), middlewares=[])
+
+    return {
+        "Jpx/issues_link": timeit(lambda jpx: jpx.issues_link, repeat, new),
+        "Jpx/issues": timeit(lambda jpx: jpx.issues, repeat, new),
+        "Jpx/peak_memory": {"bytes": peak_memory(lambda: new().issues)},
+    }
+
+
+def run(repeat: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name, (cls, directory) in PAGES.items():
+        results.update(bench_page(name, cls, directory, repeat))
+    results.update(bench_news(repeat))
+    results.update(bench_jpx(repeat))
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "repeat": repeat},
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Benchmarks worse than the baseline by more than threshold, as printable lines."""
+    regressions = []
+    for key, value in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        metric = "bytes" if "bytes" in value else "min"
+        if base[metric] > 0 and value[metric] / base[metric] - 1 > threshold:
+            ratio = value[metric] / base[metric]
+            regressions.append(f"{key}: {metric} {base[metric]:.6g} -> {value[metric]:.6g} ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="number of runs of every timing")
+    parser.add_argument("--output", help="file to write the JSON results to, stdout if omitted")
+    parser.add_argument("--compare", help="JSON results of a baseline run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="ratio of slowdown flagged as a regression")
+    args = parser.parse_args()
+    current = run(args.repeat)
+    text = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    elif not args.compare:
+        print(text)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(current, json.load(f), args.threshold)
+        for line in regressions:
+            print(line)
+        print(f"{len(regressions)} regressions above {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
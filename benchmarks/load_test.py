@@ -0,0 +1,168 @@
+"""Load test of the bulk paths against the local stand-in server.
+
+It runs Kabuyoho.fetch_pages over synthetic security codes, all the news pages of some of them, and the JPX issues,
+through the retry and adaptive concurrency middlewares, and reports pages per second and the p50 and p99 latency
+of the requests.
+
+Usage::
+
+    python benchmarks/load_test.py [--codes 200] [--latency 0.02] [--error-rate 0.01] [--throttle-rate 0.02]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000   # against a server which is already running
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# pylint: disable=wrong-import-position
+from stub_server import StubServer  # noqa: E402
+
+from kabupy import Jpx, Kabuyoho  # noqa: E402
+from kabupy.kabuyoho.kabuyoho import PAGES  # noqa: E402
+from kabupy.transport import (  # noqa: E402
+    AdaptiveConcurrencyMiddleware,
+    Handler,
+    Middleware,
+    Request,
+    Response,
+    RetryMiddleware,
+)
+
+
+class LatencyRecorder(Middleware):
+    """Middleware recording the latency and status of every request which reaches the transport."""
+
+    def __init__(self) -> None:
+        self.seconds: list[float] = []
+        self.statuses: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        start = time.perf_counter()
+        response = call_next(request)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.seconds.append(elapsed)
+            self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+
+def summary(recorder: LatencyRecorder, pages: int, errors: int, seconds: float) -> dict[str, Any]:
+    return {
+        "pages": pages,
+        "errors": errors,
+        "seconds": seconds,
+        "pages_per_second": pages / seconds if seconds > 0 else 0.0,
+        "requests": len(recorder.seconds),
+        "statuses": {str(k): v for k, v in sorted(recorder.statuses.items())},
+        "latency_ms": {
+            "p50": percentile(recorder.seconds, 50) * 1e3,
+            "p99": percentile(recorder.seconds, 99) * 1e3,
+        },
+    }
+
+
+def middlewares(recorder: LatencyRecorder, retries: int, max_limit: int) -> list[Middleware]:
+    return [
+        RetryMiddleware(retries=retries, backoff=0.05),
+        AdaptiveConcurrencyMiddleware(max_limit=max_limit),
+        recorder,
+    ]
+
+
+def run_pages(url: str, args: argparse.Namespace) -> dict[str, Any]:
+    recorder = LatencyRecorder()
+    kabuyoho = Kabuyoho(middlewares=middlewares(recorder, args.retries, args.max_limit), url=url)
+    codes = [str(1000 + i) for i in range(args.codes)]
+    pages = errors = 0
+    start = time.perf_counter()
+    for result in kabuyoho.fetch_pages(codes, PAGES, args.workers):
+        pages += 1
+        errors += result.error is not None
+    return summary(recorder, pages, errors, time.perf_counter() - start)
+
+
+def run_news(url: str, args: argparse.Namespace) -> dict[str, Any]:
+    recorder = LatencyRecorder()
+    kabuyoho = Kabuyoho(middlewares=middlewares(recorder, args.retries, args.max_limit), url=url)
+    errors = 0
+    start = time.perf_counter()
+    for i in range(args.news_codes):
+        try:
+            kabuyoho.stock(1000 + i).report_news.get_links_frame(max_page=None, time_sleep=0)
+        except Exception:  # pylint: disable=broad-except
+            errors += 1
+    return summary(recorder, recorder.statuses.get(200, 0), errors, time.perf_counter() - start)
+
+
+def run_jpx(url: str, args: argparse.Namespace) -> dict[str, Any]:
+    recorder = LatencyRecorder()
+    jpx = Jpx(middlewares=middlewares(recorder, args.retries, args.max_limit), url=url)
+    errors = 0
+    start = time.perf_counter()
+    try:
+        jpx.issues  # pylint: disable=pointless-statement
+    except Exception:  # pylint: disable=broad-except
+        errors += 1
+    return summary(recorder, recorder.statuses.get(200, 0), errors, time.perf_counter() - start)
+
+
+def run(url: str, args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "meta": {"url": url, "codes": args.codes, "pages": list(PAGES), "workers": args.workers},
+        "fetch_pages": run_pages(url, args),
+        "report_news": run_news(url, args),
+        "jpx_issues": run_jpx(url, args),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument("--url", help="base url of a running server, a stub server is started if omitted")
+    parser.add_argument("--codes", type=int, default=200, help="number of synthetic security codes")
+    parser.add_argument("--news-codes", type=int, default=10, help="number of codes whose news are fetched")
+    parser.add_argument("--news-pages", type=int, default=3, help="pages of every news category of the stub server")
+    parser.add_argument("--workers", type=int, help="worker threads, max_limit of the concurrency limiter if omitted")
+    parser.add_argument("--max-limit", type=int, default=16, help="max concurrency of the adaptive limiter")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds every response is delayed by")
+    parser.add_argument("--jitter", type=float, default=0.01, help="max random seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 500 response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="probability of a 429 response")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds of 429 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.url:
+        print(json.dumps(run(args.url, args), indent=2))
+        return
+    with StubServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        news_pages=args.news_pages,
+    ) as server:
+        print(json.dumps(run(server.url, args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Local stand-in for kabuyoho.jp and jpx.co.jp, serving the test fixtures.
+
+The kabuyoho report pages (reportTop, reportTarget, reportDps, reportTrendSignal, and reportNews with cat and page)
+are generated for any security code from the fixtures of 6758. Every news category has a given number of pages
+with a pager listing them, and pages past the last one have no news. The JPX listing page and its XLS are served
+as they are. Latency, server errors and throttling (429 with Retry-After) can be injected.
+
+Usage::
+
+    python benchmarks/stub_server.py [--port 8000] [--latency 0.05] [--error-rate 0.01] [--news-pages 3]
+
+Then point the websites at it, e.g. ``Kabuyoho(url="http://127.0.0.1:8000")``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KABUYOHO_HTML = os.path.join(ROOT, "tests", "kabuyoho", "html")
+JPX_DIR = os.path.join(ROOT, "tests", "jpx")
+TEMPLATE_CODE = "6758"
+"""Security code of the fixtures, replaced by the requested one."""
+REPORTS = {
+    "/sp/reportTop": "reportTop",
+    "/sp/reportTarget": "reportTarget",
+    "/sp/reportDps": "reportDps",
+    "/sp/reportTrendSignal": "reportTrendSignal",
+}
+NEWS_CATEGORIES = {"1": "market_report", "2": "flash_report", "3": "analyst_prediction", "4": "analyst_evaluation"}
+JPX_PAGE = "/markets/statistics-equities/misc/01.html"
+JPX_XLS = "/markets/statistics-equities/misc/tvdivq0000001vg2-att/data_j.xls"
+PAGER = re.compile(rb'<div class="pager">.*?</div>', re.DOTALL)
+NEWS_LIST = re.compile(rb'<div class="sp_news_list">.*?</ul>\s*</div>', re.DOTALL)
+NO_NEWS = '<div class="sp_news_list"><ul><li>該当するニュースがございません。</li></ul></div>'.encode()
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+class StubServer:  # pylint: disable=too-many-instance-attributes
+    """HTTP server in a background thread.
+
+    Args:
+        host (str, optional): Host to bind. Defaults to "127.0.0.1".
+        port (int, optional): Port to bind. Defaults to 0, which means any free port.
+        latency (float, optional): Seconds every response is delayed by. Defaults to 0.
+        jitter (float, optional): Max random seconds added to latency. Defaults to 0.
+        error_rate (float, optional): Probability of a 500 response. Defaults to 0.
+        throttle_rate (float, optional): Probability of a 429 response. Defaults to 0.
+        retry_after (int, optional): Retry-After seconds of 429 responses. Defaults to 1.
+        seed (int | None, optional): Seed of the random failures and jitter. Defaults to None.
+        news_pages (int, optional): Pages of every news category. Defaults to 3.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: int | None = None,
+        news_pages: int = 3,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.news_pages = news_pages
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.templates = {
+            path: _read(os.path.join(KABUYOHO_HTML, d, f"{TEMPLATE_CODE}.html")) for path, d in REPORTS.items()
+        }
+        self.news = {
+            cat: _read(os.path.join(KABUYOHO_HTML, "reportNews", d, f"{TEMPLATE_CODE}.html"))
+            for cat, d in NEWS_CATEGORIES.items()
+        }
+        self.jpx_page = _read(os.path.join(JPX_DIR, "html", "issues.html"))
+        self.jpx_xls = _read(os.path.join(JPX_DIR, "excel", "issues.xls"))
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base url of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> StubServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def respond(self, path: str, query: dict[str, list[str]]) -> tuple[int, dict[str, str], bytes]:
+        """Status, headers and body of a request."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            draw = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+        if draw < self.throttle_rate:
+            return 429, {"Retry-After": str(self.retry_after)}, b"Too Many Requests"
+        if draw < self.throttle_rate + self.error_rate:
+            return 500, {}, b"Internal Server Error"
+        html = {"Content-Type": "text/html; charset=utf-8"}
+        code = query.get("bcode", [TEMPLATE_CODE])[-1]
+        if path in self.templates:
+            return 200, html, self.templates[path].replace(TEMPLATE_CODE.encode(), code.encode())
+        if path == "/sp/reportNews" and query.get("cat", [""])[-1] in self.news:
+            page = query.get("page", ["1"])[-1]
+            return 200, html, self.news_page(code, query["cat"][-1], int(page) if page.isdigit() else 1)
+        if path == JPX_PAGE:
+            return 200, html, self.jpx_page
+        if path == JPX_XLS:
+            return 200, {"Content-Type": "application/vnd.ms-excel"}, self.jpx_xls
+        return 404, {}, b"Not Found"
+
+    def news_page(self, code: str, cat: str, page: int) -> bytes:
+        """Body of a news page, with a pager of news_pages pages. Pages past the last one have no news."""
+        body = self.news[cat].replace(TEMPLATE_CODE.encode(), code.encode())
+        if page > self.news_pages:
+            return PAGER.sub(b'<div class="pager"></div>', NEWS_LIST.sub(NO_NEWS, body, count=1), count=1)
+        return PAGER.sub(self._pager(code, cat, page), body, count=1)
+
+    def _pager(self, code: str, cat: str, page: int) -> bytes:
+        if self.news_pages <= 1:
+            return b'<div class="pager"></div>'
+
+        def link(number: int, text: str) -> str:
+            """Link to a news page."""
+            return f'<a href="/sp/reportNews?bcode={code}&amp;cat={cat}&amp;page={number}">{text}</a>'
+
+        first = link(page - 1, "<span>前へ</span>") if page > 1 else "<span>前へ</span>"
+        items = [f'<li class="pager_first">{first}</li>']
+        for number in range(1, min(self.news_pages, 3) + 1):
+            items.append(
+                f'<li><a class="visited">{number}</a></li>'
+                if number == page
+                else f"<li>{link(number, str(number))}</li>"
+            )
+        items.append('<li class="interval">...</li>')
+        items.append(f"<li>{link(self.news_pages, str(self.news_pages))}</li>")
+        if page < self.news_pages:
+            items.append(f'<li class="pager_last">{link(page + 1, "<span>次へ</span>")}</li>')
+        return f'<div class="pager"><ul>{"".join(items)}</ul></div>'.encode()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler of the stub server."""
+
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                url = urllib.parse.urlsplit(self.path)
+                status, headers, body = server.respond(url.path, urllib.parse.parse_qs(url.query))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every response is delayed by")
+    parser.add_argument("--jitter", type=float, default=0.0, help="max random seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 500 response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="probability of a 429 response")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds of 429 responses")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--news-pages", type=int, default=3, help="pages of every news category")
+    args = parser.parse_args()
+    server = StubServer(
+        args.host,
+        args.port,
+        args.latency,
+        args.jitter,
+        args.error_rate,
+        args.throttle_rate,
+        args.retry_after,
+        args.seed,
+        args.news_pages,
+    )
+    print(f"Serving on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
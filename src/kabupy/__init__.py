@@ -2,10 +2,50 @@
 
 from __future__ import annotations
 
-from .jpx import Jpx
-from .kabuyoho import Kabuyoho
+import importlib
+import sys
+import threading
+import types
+from typing import Any
 
 __version__ = "0.0.7"
 
-kabuyoho = Kabuyoho()
-jpx = Jpx()
+# Jpx, Kabuyoho and the default websites are imported on first access (PEP 562),
+# so that "import kabupy" does not pull in pandas, bs4, requests and money.
+_CLASSES = {"Jpx": ".jpx", "Kabuyoho": ".kabuyoho"}
+_WEBSITES = {"jpx": "Jpx", "kabuyoho": "Kabuyoho"}
+_lock = threading.RLock()
+
+
+class _Module(types.ModuleType):
+    """Module which keeps the default websites bound to their names.
+
+    Importing a submodule, e.g. kabupy.kabuyoho.screening, binds the subpackage to the attribute of the same name.
+    The default website used to shadow it, so the binding is ignored.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _WEBSITES and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+def __getattr__(name: str) -> Any:
+    with _lock:
+        if name in globals():
+            return globals()[name]
+        if name in _CLASSES:
+            value = getattr(importlib.import_module(_CLASSES[name], __name__), name)
+        elif name in _WEBSITES:
+            value = __getattr__(_WEBSITES[name])()
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        globals()[name] = value
+        return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_CLASSES) | set(_WEBSITES))
+
+
+sys.modules[__name__].__class__ = _Module
@@ -0,0 +1,6 @@
+"""kabupy.archive module."""
+from __future__ import annotations
+
+from .page_archive import ArchiveRecord, PageArchive
+
+__all__ = ["ArchiveRecord", "PageArchive"]
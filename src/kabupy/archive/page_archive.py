@@ -0,0 +1,173 @@
+"""Append-only archive of fetched pages."""
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import threading
+from datetime import datetime
+from typing import NamedTuple
+
+from ..exceptions import KabupyError
+
+MAGIC = b"KABUPY-ARCHIVE/1 "
+"""Prefix of every record header in an archive file."""
+
+
+class ArchiveRecord(NamedTuple):
+    """Index entry of a page stored in an archive."""
+
+    url: str
+    fetched_at: datetime
+    offset: int
+    length: int
+    encoding: str | None = None
+    status: int = 200
+
+
+class PageArchive:
+    """Append-only archive of fetched pages, a bit like WARC.
+
+    Every page is appended to a single archive file as a one-line JSON header followed by the raw body.
+    The offsets of the bodies are kept in a sidecar index file (``<path>.idx``) keyed by (url, fetch time),
+    so readers memory-map the archive and slice bodies out of it without scanning the file.
+
+    Args:
+        path (str | os.PathLike): Path to the archive file. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = os.fspath(path)
+        self.index_path = self.path + ".idx"
+        self._lock = threading.Lock()
+        self._index: dict[str, list[ArchiveRecord]] = {}
+        self._mmap: mmap.mmap | None = None
+        with open(self.path, "ab"), open(self.index_path, "ab"):
+            pass
+        with open(self.index_path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    self._add(self._decode_index(json.loads(line)))
+
+    def __enter__(self) -> PageArchive:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._index.values())
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def close(self) -> None:
+        """Unmap the archive file."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    def append(  # pylint: disable=too-many-arguments
+        self,
+        url: str,
+        content: bytes,
+        encoding: str | None = None,
+        status: int = 200,
+        fetched_at: datetime | None = None,
+    ) -> ArchiveRecord:
+        """Append a page to the archive.
+
+        Args:
+            url (str): URL of the page.
+            content (bytes): Raw body of the response.
+            encoding (str | None, optional): Encoding of the body. Defaults to None.
+            status (int, optional): HTTP status code. Defaults to 200.
+            fetched_at (datetime | None, optional): Fetch time. Defaults to now.
+
+        Returns:
+            ArchiveRecord: Index entry of the appended page.
+        """
+        fetched_at = fetched_at or datetime.now()
+        header = {
+            "url": url,
+            "fetched_at": fetched_at.isoformat(),
+            "length": len(content),
+            "encoding": encoding,
+            "status": status,
+        }
+        head = MAGIC + json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            with open(self.path, "ab") as handle:
+                offset = handle.tell() + len(head)
+                handle.write(head)
+                handle.write(content)
+                handle.write(b"\n")
+            record = ArchiveRecord(url, fetched_at, offset, len(content), encoding, status)
+            with open(self.index_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(self._encode_index(record), ensure_ascii=False) + "\n")
+            self._add(record)
+        return record
+
+    def records(self, url: str | None = None) -> list[ArchiveRecord]:
+        """Index entries of the archive, sorted by fetch time for each url.
+
+        Args:
+            url (str | None, optional): If given, only the records of this url are returned.
+        """
+        if url is not None:
+            return list(self._index.get(url, []))
+        return [record for records in self._index.values() for record in records]
+
+    def find(self, url: str, as_of: datetime | None = None) -> ArchiveRecord:
+        """Find the latest record of a url fetched at or before as_of.
+
+        Args:
+            url (str): URL of the page.
+            as_of (datetime | None, optional): Point in time to replay. Defaults to the latest record.
+
+        Raises:
+            KabupyError: If no such record is archived.
+        """
+        records = self._index.get(url, [])
+        if as_of is None:
+            i = len(records)
+        else:
+            i = bisect.bisect_right([r.fetched_at for r in records], as_of)
+        if i == 0:
+            raise KabupyError(f"{url} is not archived" + ("" if as_of is None else f" as of {as_of}"))
+        return records[i - 1]
+
+    def read(self, record: ArchiveRecord) -> bytes:
+        """Read the body of a record from the memory-mapped archive."""
+        with self._lock:
+            end = record.offset + record.length
+            if self._mmap is None or len(self._mmap) < end:
+                if self._mmap is not None:
+                    self._mmap.close()
+                with open(self.path, "rb") as handle:
+                    self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap[record.offset : end]
+
+    def get(self, url: str, as_of: datetime | None = None) -> tuple[bytes, ArchiveRecord]:
+        """Return the body and the record of a url as it was at as_of."""
+        record = self.find(url, as_of)
+        return self.read(record), record
+
+    def _add(self, record: ArchiveRecord) -> None:
+        records = self._index.setdefault(record.url, [])
+        records.append(record)
+        if len(records) > 1 and records[-2].fetched_at > record.fetched_at:
+            records.sort(key=lambda r: r.fetched_at)
+
+    @staticmethod
+    def _encode_index(record: ArchiveRecord) -> dict:
+        res = record._asdict()
+        res["fetched_at"] = record.fetched_at.isoformat()
+        return res
+
+    @staticmethod
+    def _decode_index(entry: dict) -> ArchiveRecord:
+        entry["fetched_at"] = datetime.fromisoformat(entry["fetched_at"])
+        return ArchiveRecord(**entry)
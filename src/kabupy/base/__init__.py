@@ -1,8 +1,17 @@
 """Base classes."""
 from __future__ import annotations
 
-from .decorators import webpage_property
-from .webpage import Webpage
-from .website import Website
+from .decorators import cached_property, webpage_property
+from .singleflight import SingleFlight
+from .webpage import Webpage, memory_usage
+from .website import Website, default_middlewares
 
-__all__ = ["Website", "Webpage", "webpage_property"]
+__all__ = [
+    "Website",
+    "Webpage",
+    "webpage_property",
+    "cached_property",
+    "default_middlewares",
+    "SingleFlight",
+    "memory_usage",
+]
@@ -1,6 +1,51 @@
 """page property"""
 from __future__ import annotations
 
+import functools
+from typing import NamedTuple
+
+
+class Failure(NamedTuple):
+    """Error of a webpage property, memoized by Webpage.extract to be raised again on access."""
+
+    error: Exception
+
 
 class webpage_property(property):  # pylint: disable=C0103
-    """webpage property"""
+    """webpage property
+
+    The value is memoized on the webpage until the webpage changes.
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        assert self.fget is not None
+        values = instance.values
+        name = self.fget.__name__
+        try:
+            value = values[name]
+        except KeyError:
+            value = values[name] = super().__get__(instance, owner)
+            return value
+        if type(value) is Failure:  # pylint: disable=unidiomatic-typecheck
+            raise value.error
+        return value
+
+
+class cached_property(functools.cached_property):  # pylint: disable=C0103
+    """functools.cached_property without its lock.
+
+    Before Python 3.12 the lock of functools.cached_property is shared by all the instances of a class,
+    so that e.g. report_top of different stocks could not be loaded concurrently.
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        try:
+            return cache[self.attrname]
+        except KeyError:
+            value = cache[self.attrname] = self.func(instance)
+            return value
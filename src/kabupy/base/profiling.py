@@ -0,0 +1,161 @@
+"""Opt-in profiling of webpage properties and selectors.
+
+Profiling patches Webpage.select_one, Webpage.select and webpage_property while it is enabled,
+so it costs nothing while it is disabled.
+
+Example::
+
+    from kabupy.base import profiling
+
+    with profiling.profile():
+        stock.report_top.extract()
+    profiling.dump()
+"""
+from __future__ import annotations
+
+import contextlib
+import sys
+import threading
+import time
+from typing import IO, Any, Callable, Iterator, NamedTuple
+
+from ..errors import ElementNotFoundError
+from .decorators import webpage_property
+from .webpage import Webpage
+
+_lock = threading.Lock()
+_local = threading.local()
+_stats: dict[tuple[str, str | None, str | None], list] = {}
+_originals: dict[str, Callable[..., Any]] = {}
+
+
+class ProfileEntry(NamedTuple):
+    """Statistics of a webpage property, or of a selector used by it."""
+
+    cls: str
+    """Name of the webpage class."""
+    property: str | None
+    """Name of the webpage property, None for a selector used outside of webpage properties."""
+    selector: str | None
+    """Selector, None for the webpage property as a whole."""
+    calls: int
+    seconds: float
+    """Cumulative seconds. Those of a property include the selectors it used."""
+    failures: int
+    """Number of calls which raised, e.g. ElementNotFoundError."""
+
+
+def _record(key: tuple[str, str | None, str | None], seconds: float, failed: bool) -> None:
+    with _lock:
+        entry = _stats.setdefault(key, [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += failed
+
+
+def _stack() -> list[str]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _profiled_get(self, instance, owner=None):
+    name = self.fget.__name__
+    if instance is None or name in instance.values:
+        return _originals["__get__"](self, instance, owner)
+    stack = _stack()
+    stack.append(name)
+    failed = False
+    start = time.perf_counter()
+    try:
+        return _originals["__get__"](self, instance, owner)
+    except Exception:
+        failed = True
+        raise
+    finally:
+        _record((type(instance).__name__, name, None), time.perf_counter() - start, failed)
+        stack.pop()
+
+
+def _profiled(method: str):
+    def wrapper(self, selector: str):
+        stack = _stack()
+        failed = False
+        start = time.perf_counter()
+        try:
+            return _originals[method](self, selector)
+        except ElementNotFoundError:
+            failed = True
+            raise
+        finally:
+            key = (type(self).__name__, stack[-1] if stack else None, selector)
+            _record(key, time.perf_counter() - start, failed)
+
+    wrapper.__name__ = method
+    wrapper.__doc__ = getattr(Webpage, method).__doc__
+    return wrapper
+
+
+def is_enabled() -> bool:
+    """True if profiling is enabled."""
+    return bool(_originals)
+
+
+def enable() -> None:
+    """Start recording statistics. Statistics recorded before are kept, see reset."""
+    if is_enabled():
+        return
+    _originals["__get__"] = webpage_property.__get__
+    _originals["select_one"] = Webpage.select_one
+    _originals["select"] = Webpage.select
+    setattr(webpage_property, "__get__", _profiled_get)
+    setattr(Webpage, "select_one", _profiled("select_one"))
+    setattr(Webpage, "select", _profiled("select"))
+
+
+def disable() -> None:
+    """Stop recording statistics and restore the unprofiled methods."""
+    if not is_enabled():
+        return
+    setattr(webpage_property, "__get__", _originals.pop("__get__"))
+    setattr(Webpage, "select_one", _originals.pop("select_one"))
+    setattr(Webpage, "select", _originals.pop("select"))
+
+
+def reset() -> None:
+    """Drop the recorded statistics."""
+    with _lock:
+        _stats.clear()
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[None]:
+    """Enable profiling within a with block."""
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def stats() -> list[ProfileEntry]:
+    """Recorded statistics, the most costly first."""
+    with _lock:
+        entries = [ProfileEntry(*key, *values) for key, values in _stats.items()]
+    return sorted(entries, key=lambda entry: entry.seconds, reverse=True)
+
+
+def dump(file: IO[str] | None = None, limit: int | None = None) -> None:
+    """Print the recorded statistics as a table, the most costly first.
+
+    Args:
+        file (IO[str] | None, optional): File to print to. Defaults to None, which means sys.stdout.
+        limit (int | None, optional): Max number of rows. Defaults to None, which means all.
+    """
+    file = file or sys.stdout
+    print(f"{'seconds':>10} {'calls':>7} {'failures':>8}  class.property [selector]", file=file)
+    for entry in stats()[:limit]:
+        name = f"{entry.cls}.{entry.property or '-'}"
+        if entry.selector is not None:
+            name += f" [{entry.selector}]"
+        print(f"{entry.seconds:>10.6f} {entry.calls:>7} {entry.failures:>8}  {name}", file=file)
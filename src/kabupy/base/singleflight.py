@@ -0,0 +1,52 @@
+"""Single-flight coalescing of concurrent calls"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into a single call.
+
+    While a call for a key is in flight, other threads calling with the same key wait for it
+    and get its result (or its exception) instead of making their own call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def call(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Call func, or wait for the call in flight for the same key, and return its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = func()
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def __len__(self) -> int:
+        """Number of calls in flight."""
+        with self._lock:
+            return len(self._calls)
@@ -1,32 +1,224 @@
 """Base class for webpage"""
 from __future__ import annotations
 
+import hashlib
+import time
+import weakref
 from abc import ABC
+from typing import Any, Mapping
 
-import requests
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
 from ..errors import ElementNotFoundError
+from ..transport import Response
+from ..util import tracing
+from ..util.compression import compress, decompress
+from .decorators import Failure, webpage_property
+from .website import Website
 
+SOUP_SIZE_FACTOR = 25
+"""Approximate ratio of the memory used by a parsed soup to the size of its html."""
 
-class Webpage(ABC):
+_live_pages: weakref.WeakSet[Webpage] = weakref.WeakSet()
+
+
+def memory_usage() -> dict[str, int]:
+    """Approximate bytes of memory held across all live webpages.
+
+    Returns:
+        dict[str, int]: "pages": number of live webpages,
+                        "content": bytes of the bodies as held, i.e. compressed if they are,
+                        "soup": estimated bytes of the parsed soups,
+                        "total": sum of "content" and "soup".
+    """
+    content = soup = pages = 0
+    for page in list(_live_pages):
+        pages += 1
+        content += len(page._body or b"")  # pylint: disable=protected-access
+        if page._soup is not None:  # pylint: disable=protected-access
+            soup += page.size * SOUP_SIZE_FACTOR
+    return {"pages": pages, "content": content, "soup": soup, "total": content + soup}
+
+
+class Webpage(ABC):  # pylint: disable=too-many-instance-attributes
     """Base class for website"""
 
     url: str
-    html: str
-    soup: BeautifulSoup
+    website: Website
+    encoding: str | None = None
+    headers: Mapping[str, str]
+    digest: str
+    """SHA-256 of the content."""
+    size: int = 0
+    """Bytes of the content."""
+    codec: str | None = None
+    """Codec the content is held compressed with, None if it is held as is."""
+    loaded_at: float | None = None
+    """time.monotonic() when the webpage was last loaded or validated."""
+    _body: bytes | None = None
+    _soup: BeautifulSoup | None = None
 
     def __init__(self, load: bool = True) -> None:
+        self.values: dict[str, Any] = {}
+        """Memoized values of webpage properties."""
+        _live_pages.add(self)
         if load:
             self.load()
 
+    @property
+    def content(self) -> bytes:
+        """Raw body of the webpage, decompressed on each access if it is held compressed."""
+        if self._body is None:
+            raise AttributeError(f"content of {self.url} is not loaded or released")
+        return self._body if self.codec is None else decompress(self._body, self.codec)
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Parsed content. If it was released while the content is held, the content is parsed again."""
+        if self._soup is None:
+            self._soup = self.parse(self.content, self.encoding)
+        return self._soup
+
+    @property
+    def html(self) -> str:
+        """Decoded html of the webpage"""
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes of memory held by the webpage and the webpages it holds."""
+        size = 0
+        for value in vars(self).values():
+            if isinstance(value, Webpage):
+                size += value.nbytes
+        size += len(self._body or b"")
+        if self._soup is not None:
+            size += self.size * SOUP_SIZE_FACTOR
+        return size
+
     def load(self):
-        """Load webpage and set html and soup"""
-        response = requests.get(self.url, timeout=10)
-        response.raise_for_status()
-        self.html = response.text
-        self.soup = BeautifulSoup(self.html, "html.parser")
+        """Load webpage through the website and set content and soup.
+
+        Concurrent loads of the same url on a website, from any page object, share one fetch and one parse.
+        """
+        self._set(*self.website.single_flight.call(self.url, self._download))
+
+    def reload(self) -> bool:
+        """Reload the webpage in place with a conditional request.
+
+        If the server answers 304 Not Modified or the same body as before,
+        the parsed soup and the memoized values are kept.
+
+        Returns:
+            bool: True if the webpage changed.
+        """
+        if self.loaded_at is None:
+            self.load()
+            return True
+        headers = {}
+        if "ETag" in self.headers:
+            headers["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        response = self.website.fetch(self.url, headers)
+        if response.status_code == 304 or hashlib.sha256(response.content).hexdigest() == self.digest:
+            self.loaded_at = time.monotonic()
+            return False
+        encoding = response.encoding or response.apparent_encoding
+        soup, values = self._restore(response.content, encoding)
+        self._set(response, encoding, soup, values)
+        if values is None:
+            self._store()
+        return True
+
+    def _download(self) -> tuple[Response, str | None, BeautifulSoup | None, dict[str, Any] | None]:
+        """Fetch and parse the webpage. Run by the leader of a single flight only.
+
+        On a miss of the value store, the leader extracts and stores the values,
+        and the pages sharing its flight get them instead of extracting them again.
+        """
+        response = self.website.fetch(self.url)
+        encoding = response.encoding or response.apparent_encoding
+        soup, values = self._restore(response.content, encoding)
+        if values is None and self.website.value_store is not None:
+            self._set(response, encoding, soup, None)
+            values = self._store()
+        return response, encoding, soup, values
+
+    def _store(self) -> dict[str, Any] | None:
+        """Extract all webpage properties into the value store of the website, if any, and return them."""
+        store = self.website.value_store
+        if store is None:
+            return None
+        values = self.extract()
+        store.put(type(self).__qualname__, self.digest, values)
+        return values
+
+    def _restore(self, content: bytes, encoding: str | None) -> tuple[BeautifulSoup | None, dict[str, Any] | None]:
+        """Values stored for the content in the value store of the website, or else the parsed content."""
+        store = self.website.value_store
+        if store is not None:
+            values = store.get(type(self).__qualname__, hashlib.sha256(content).hexdigest())
+            if values is not None:
+                return None, values
+        return self.parse(content, encoding), None
+
+    def _set(
+        self, response: Response, encoding: str | None, soup: BeautifulSoup | None, values: dict[str, Any] | None
+    ) -> None:
+        content = response.content
+        self.codec = self.website.compression
+        self._body = content if self.codec is None else compress(content, self.codec)
+        self.size = len(content)
+        self.digest = hashlib.sha256(content).hexdigest()
+        self.encoding = encoding
+        self.headers = response.headers
+        self._soup = soup
+        self.values = dict(values or {})
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def webpage_properties(cls) -> list[str]:
+        """Names of the webpage properties of the class."""
+        return [name for name in dir(cls) if isinstance(getattr(cls, name, None), webpage_property)]
+
+    def extract(self) -> dict[str, Any]:
+        """Evaluate all webpage properties and return the memoized values.
+
+        An error of a property is memoized too, and raised again when the property is accessed.
+        """
+        with tracing.span("extract", url=self.url):
+            for name in self.webpage_properties():
+                if name not in self.values:
+                    try:
+                        getattr(self, name)
+                    except Exception as ex:  # pylint: disable=broad-except
+                        self.values[name] = Failure(ex)
+        return self.values
+
+    def release(self) -> None:
+        """Extract all webpage properties, then free soup, and content unless it is held compressed.
+
+        Webpage properties keep being served from the extracted values.
+        If the content is held compressed, it is parsed again when soup is needed.
+        Otherwise html, select and select_one are not available until the webpage is loaded again.
+        """
+        if self._body is None:
+            return
+        self.extract()
+        self._soup = None
+        if self.codec is None:
+            self._body = None
+
+    @staticmethod
+    def parse(content: bytes, encoding: str | None = None) -> BeautifulSoup:
+        """Parse a raw response body.
+
+        The body is handed to the parser as bytes, so it is never decoded into an intermediate str.
+        """
+        with tracing.span("parse", bytes=len(content)):
+            return BeautifulSoup(content, "html.parser", from_encoding=encoding)
 
     def select_one(self, selector: str) -> Tag:
         """Select one element from soup"""
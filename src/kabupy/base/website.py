@@ -2,11 +2,75 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Sequence
+
+from ..store import ValueStore
+from ..transport import (
+    CircuitBreakerMiddleware,
+    MetricsMiddleware,
+    Middleware,
+    Request,
+    RequestsTransport,
+    Response,
+    RetryMiddleware,
+    Transport,
+    build_handler,
+)
+from .singleflight import SingleFlight
+
+DEFAULT_TRANSPORT = RequestsTransport()
+"""Transport shared by websites which are not given their own."""
+
+
+def default_middlewares() -> list[Middleware]:
+    """Middlewares of a website which is not given its own.
+
+    Failed requests are retried with backoff, and a host which keeps failing is shed by a circuit breaker,
+    so that a bulk crawl degrades gracefully instead of piling more load on a struggling site.
+    Every attempt is recorded in kabupy.util.metrics.DEFAULT_REGISTRY by a MetricsMiddleware.
+    """
+    return [RetryMiddleware(), CircuitBreakerMiddleware(), MetricsMiddleware()]
 
 
 class Website(ABC):
-    """Base class for website"""
+    """Base class for website
+
+    Args:
+        transport (Transport | None, optional): Transport used to fetch pages. Defaults to DEFAULT_TRANSPORT.
+        middlewares (Sequence[Middleware] | None, optional): Middlewares in front of the transport,
+            the outermost first. Defaults to default_middlewares().
+    """
+
+    url: str
+
+    release_soup: bool = False
+    """If True, pages loaded through stocks release their soup and content once their properties are extracted."""
+
+    compression: str | None = None
+    """Codec pages hold their content compressed with, "zlib" or "zstd" (see kabupy.util.compression).
+    Defaults to None, which means content is held as is."""
+
+    value_store: ValueStore | None = None
+    """Store of extracted values. If set, a page whose content was stored before is not parsed,
+    unless a property which was not stored is accessed. Defaults to None."""
 
     @abstractmethod
-    def __init__(self):
-        self.url: str
+    def __init__(self, transport: Transport | None = None, middlewares: Sequence[Middleware] | None = None) -> None:
+        self.transport = transport or DEFAULT_TRANSPORT
+        self.middlewares = default_middlewares() if middlewares is None else list(middlewares)
+        self.single_flight = SingleFlight()
+
+    def fetch(self, url: str, headers: dict[str, str] | None = None) -> Response:
+        """Fetch a url through the middlewares and the transport of the website.
+
+        Args:
+            url (str): URL to fetch.
+            headers (dict[str, str] | None, optional): Headers of the request. Defaults to None.
+
+        Raises:
+            requests.HTTPError: If the response is an error.
+        """
+        handler = build_handler(self.middlewares, self.transport)
+        response = handler(Request(url, dict(headers or {})))
+        response.raise_for_status()
+        return response
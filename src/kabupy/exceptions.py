@@ -3,3 +3,7 @@
 
 class KabupyError(Exception):
     """General error class for kabupy"""
+
+
+class CircuitOpenError(KabupyError):
+    """Error raised when a request is shed because the circuit of its host is open"""
@@ -3,28 +3,40 @@ from __future__ import annotations
 
 import functools
 import urllib.parse
+from typing import Sequence
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
 from ..base import Website
 from ..exceptions import KabupyError
+from ..transport import Middleware, Transport
 
 
 class Jpx(Website):
-    """An object for jpx.co.jp"""
+    """An object for jpx.co.jp
 
-    def __init__(self) -> None:
-        self.url = "https://www.jpx.co.jp"
+    Args:
+        transport (Transport | None, optional): Transport used to fetch pages.
+        middlewares (Sequence[Middleware] | None, optional): Middlewares in front of the transport.
+        url (str, optional): Base url of the website, e.g. of a local stand-in for load tests.
+            Defaults to "https://www.jpx.co.jp".
+    """
+
+    def __init__(
+        self,
+        transport: Transport | None = None,
+        middlewares: Sequence[Middleware] | None = None,
+        url: str = "https://www.jpx.co.jp",
+    ) -> None:
+        super().__init__(transport, middlewares)
+        self.url = url
 
     @functools.cached_property
     def issues_link(self) -> str:
         """Return a link to the issues list."""
-        response = requests.get("https://www.jpx.co.jp/markets/statistics-equities/misc/01.html", timeout=10)
-        response.raise_for_status()
-        response.encoding = response.apparent_encoding
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = self.fetch(urllib.parse.urljoin(self.url, "markets/statistics-equities/misc/01.html"))
+        soup = BeautifulSoup(response.content, "html.parser", from_encoding=response.apparent_encoding)
         href = soup.select_one('th:-soup-contains("東証上場銘柄一覧") + td>a')
         if href is None:
             raise KabupyError("no link was found.")
@@ -35,8 +47,7 @@ class Jpx(Website):
     def issues(self):
         """Return a list of issues."""
         link = self.issues_link
-        response = requests.get(link, timeout=10)
-        response.raise_for_status()
+        response = self.fetch(link)
         return pd.read_excel(
             response.content,
             names=[
@@ -1,6 +1,34 @@
 """kabupy.kabuyoho module."""
 from __future__ import annotations
 
-from .kabuyoho import Kabuyoho
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["Kabuyoho"]
+from .kabuyoho import PAGES, Kabuyoho, PageResult, Stock
+from .planner import FetchPlanner, Plan
+from .records import Dividend, NewsItem, records_to_frame
+
+if TYPE_CHECKING:
+    from .screening import Predicate, screen, snapshot_frame
+
+__all__ = [
+    "PAGES",
+    "Dividend",
+    "FetchPlanner",
+    "Kabuyoho",
+    "NewsItem",
+    "PageResult",
+    "Plan",
+    "Predicate",
+    "Stock",
+    "records_to_frame",
+    "screen",
+    "snapshot_frame",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # The screening module needs numpy and pandas, so it is imported on first access.
+    if name in ("Predicate", "screen", "snapshot_frame"):
+        return getattr(importlib.import_module(".screening", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,21 @@
 """Scraper for kabuyoho.jp"""
 from __future__ import annotations
 
-import functools
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple, Sequence
 
-from ..base import Website
+from money import Money
+
+from ..base import Webpage, Website, cached_property
+from ..base.decorators import Failure
+from ..store import Change, SnapshotStore, ValueStore
+from ..transport import AdaptiveConcurrencyMiddleware, Middleware, Transport
+from ..util import tracing
+from ..util.cache import LRUCache
+from .kabuyoho_webpage import KabuyohoWebpage
 from .report_dps import ReportDps
 from .report_news import ReportNews
 from .report_target import ReportTarget
@@ -13,16 +24,192 @@ from .report_trend_signal import ReportTrendSignal
 
 logger = logging.getLogger(__name__)
 
+PAGES = ("report_top", "report_target", "report_dps", "report_trend_signal")
+"""Names of the Stock attributes of the pages fetched by default in bulk."""
+
+PAGE_CLASSES: dict[str, type[KabuyohoWebpage]] = {
+    "report_dps": ReportDps,
+    "report_trend_signal": ReportTrendSignal,
+    "report_top": ReportTop,
+    "report_target": ReportTarget,
+}
+"""Classes of the pages with the header block by Stock attribute name, from the cheapest to fetch."""
+
+HEADER_PAGES = tuple(PAGE_CLASSES)
+"""Names of the Stock attributes of the pages with the header block, from the cheapest to fetch."""
+
 
 class Kabuyoho(Website):
-    """An object for kabuyoho.jp"""
+    """An object for kabuyoho.jp
+
+    Args:
+        transport (Transport | None, optional): Transport used to fetch pages.
+        middlewares (Sequence[Middleware] | None, optional): Middlewares in front of the transport.
+        stocks (LRUCache | None, optional): Registry of Stock objects keyed by security code.
+            If given, stock() returns the same Stock for the same code while it stays in the registry,
+            so its loaded pages are served from memory. Unless it has its own sizeof, it is sized by Stock.nbytes.
+            Defaults to None, which means stock() always returns a new Stock.
+        max_age (Mapping[str, float] | None, optional): Max age in seconds of pages by Stock attribute name,
+            e.g. ``{"report_top": 60}``. A page older than its max age is reloaded in place when accessed.
+            Defaults to None, which means pages never go stale.
+        url (str, optional): Base url of the website, e.g. of a local stand-in for load tests.
+            Defaults to "https://kabuyoho.jp".
+        release_soup (bool, optional): If True, pages loaded through stocks release their soup and content
+            once their properties are extracted. Defaults to False.
+        compression (str | None, optional): Codec pages hold their content compressed with, "zlib" or "zstd"
+            (see kabupy.util.compression). Defaults to None, which means content is held as is.
+        value_store (ValueStore | None, optional): Store of extracted values. A page whose content was stored
+            before is not parsed, unless a property which was not stored is accessed. Defaults to None.
+    """
 
-    def __init__(self) -> None:
-        self.url = "https://kabuyoho.jp"
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        transport: Transport | None = None,
+        middlewares: Sequence[Middleware] | None = None,
+        stocks: LRUCache | None = None,
+        max_age: Mapping[str, float] | None = None,
+        url: str = "https://kabuyoho.jp",
+        release_soup: bool = False,
+        compression: str | None = None,
+        value_store: ValueStore | None = None,
+    ) -> None:
+        super().__init__(transport, middlewares)
+        self.url = url
+        self.release_soup = release_soup
+        self.compression = compression
+        self.value_store = value_store
+        self.stocks = stocks
+        self.max_age = dict(max_age or {})
+        if stocks is not None and stocks.sizeof is None:
+            stocks.sizeof = lambda stock: stock.nbytes
 
     def stock(self, security_code: str | int) -> Stock:
         """Return Stock object"""
-        return Stock(self, security_code)
+        if self.stocks is None:
+            return Stock(self, security_code)
+        return self.stocks.setdefault(str(security_code), lambda: Stock(self, security_code))
+
+    def fetch_pages(
+        self, security_codes: Iterable[str | int], pages: Sequence[str] = PAGES, max_workers: int | None = None
+    ) -> Iterator[PageResult]:
+        """Load pages of many stocks concurrently, yielding each result as it completes.
+
+        A page which fails to load is yielded with its error instead of stopping the whole batch.
+        If the website has an AdaptiveConcurrencyMiddleware, it decides how many requests are actually
+        in flight, and max_workers only bounds it.
+
+        Args:
+            security_codes (Iterable[str | int]): Security codes of the stocks.
+            pages (Sequence[str], optional): Names of the Stock attributes of the pages. Defaults to PAGES.
+            max_workers (int | None, optional): Number of worker threads.
+                Defaults to max_limit of the AdaptiveConcurrencyMiddleware if any, 4 otherwise.
+        """
+        stocks = [self.stock(code) for code in security_codes]
+        return self.fetch_stock_pages([(stock, page) for stock in stocks for page in pages], max_workers)
+
+    def fetch_changes(
+        self,
+        security_codes: Iterable[str | int],
+        snapshots: SnapshotStore,
+        pages: Sequence[str] = PAGES,
+        max_workers: int | None = None,
+    ) -> Iterator[Change]:
+        """Load pages of many stocks concurrently like fetch_pages, and yield only the fields which changed.
+
+        When all the pages of a stock are done, the snapshot of its loaded pages is compared with
+        the one stored in snapshots, and merged into it. Fields of pages which failed to load are not compared.
+        Note that with a stock registry, loaded pages are only fetched again once they are older than max_age.
+
+        Args:
+            security_codes (Iterable[str | int]): Security codes of the stocks.
+            snapshots (SnapshotStore): Store of the previous snapshots.
+            pages (Sequence[str], optional): Names of the Stock attributes of the pages. Defaults to PAGES.
+            max_workers (int | None, optional): Number of worker threads. See fetch_pages.
+        """
+        stocks = {stock.security_code: stock for stock in map(self.stock, security_codes)}
+        remaining = {code: len(pages) for code in stocks}
+        loaded: dict[str, list[str]] = {code: [] for code in stocks}
+        stock_pages = [(stock, page) for stock in stocks.values() for page in pages]
+        for result in self.fetch_stock_pages(stock_pages, max_workers):
+            code = result.stock.security_code
+            remaining[code] -= 1
+            if result.error is None:
+                loaded[code].append(result.page)
+            if remaining[code] == 0:
+                yield from snapshots.update(code, result.stock.snapshot(loaded[code]))
+
+    def fetch_stock_pages(
+        self, stock_pages: Iterable[tuple[Stock, str]], max_workers: int | None = None
+    ) -> Iterator[PageResult]:
+        """Load pairs of a stock and the name of its page concurrently. See fetch_pages for the details."""
+        if max_workers is None:
+            limiter = next((m for m in self.middlewares if isinstance(m, AdaptiveConcurrencyMiddleware)), None)
+            max_workers = limiter.max_limit if limiter is not None else 4
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_load_page, stock, page, time.perf_counter()): (stock, page)
+                for stock, page in stock_pages
+            }
+            for future in as_completed(futures):
+                stock, page = futures[future]
+                error = future.exception()
+                if error is not None:
+                    logger.warning("Failed to load %s of %s: %s", page, stock.security_code, error)
+                yield PageResult(stock, page, error)
+
+
+def _load_page(stock: Stock, page: str, submitted: float) -> Webpage:
+    tracer = tracing.current()
+    if tracer is not None:
+        tracer.add("queue", submitted, time.perf_counter(), code=stock.security_code, page=page)
+    with tracing.span("load", code=stock.security_code, page=page):
+        return getattr(stock, page)
+
+
+class PageResult(NamedTuple):
+    """Result of a page loaded by Kabuyoho.fetch_pages."""
+
+    stock: Stock
+    page: str
+    """Name of the Stock attribute of the page."""
+    error: BaseException | None = None
+    """Error raised while loading the page, None if it was loaded."""
+
+
+class stock_page(cached_property):  # pylint: disable=C0103
+    """Page of a stock.
+
+    It is loaded once, released if the website has release_soup, accounted in the stock registry of its website,
+    and reloaded in place when it is older than its max age.
+    Unlike cached_property, it is a data descriptor so that every access checks the age of the page.
+    """
+
+    def __set__(self, instance, value):
+        assert self.attrname is not None
+        instance.__dict__[self.attrname] = value
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        name = self.attrname
+        assert name is not None
+        website = instance.website
+        page = instance.__dict__.get(name)
+        if page is None:
+            page = instance.__dict__[name] = self.func(instance)
+        elif (
+            name in website.max_age
+            and page.loaded_at is not None
+            and time.monotonic() - page.loaded_at > website.max_age[name]
+        ):
+            website.single_flight.call(("reload", id(page)), page.reload)
+        else:
+            return page
+        if website.release_soup:
+            page.release()
+        if website.stocks is not None:
+            website.stocks.resize(instance.security_code)
+        return page
 
 
 class Stock:
@@ -32,27 +219,97 @@ class Stock:
         self.security_code = str(security_code)
         self.website = website
 
-    @functools.cached_property
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes of memory held by the loaded pages."""
+        return sum(page.nbytes for page in vars(self).values() if isinstance(page, Webpage))
+
+    def refresh(self, pages: Iterable[str] | None = None) -> list[str]:
+        """Reload loaded pages in place, with conditional requests.
+
+        Pages which did not change keep their parsed state and memoized values.
+
+        Args:
+            pages (Iterable[str] | None, optional): Names of the pages to refresh, e.g. ``["report_top"]``.
+                Pages which are not loaded yet are skipped. Defaults to None, which means all loaded pages.
+
+        Returns:
+            list[str]: Names of the pages which changed.
+        """
+        names = [k for k, v in vars(self).items() if isinstance(v, Webpage)] if pages is None else list(pages)
+        changed = [name for name in names if name in vars(self) and vars(self)[name].reload()]
+        if self.website.release_soup:
+            for name in names:
+                if name in vars(self):
+                    vars(self)[name].release()
+        if self.website.stocks is not None:
+            self.website.stocks.resize(self.security_code)
+        return changed
+
+    def snapshot(self, pages: Iterable[str] | None = None) -> dict[str, Any]:
+        """Values of all webpage properties of loaded pages, keyed by "<page>.<property>".
+
+        The value of a property which cannot be read is None.
+
+        Args:
+            pages (Iterable[str] | None, optional): Names of the pages. Pages which are not loaded are skipped.
+                Defaults to None, which means all loaded pages.
+        """
+        names = [k for k, v in vars(self).items() if isinstance(v, Webpage)] if pages is None else pages
+        snapshot = {}
+        for name in names:
+            page = vars(self).get(name)
+            if page is None:
+                continue
+            for field, value in page.extract().items():
+                snapshot[f"{name}.{field}"] = None if isinstance(value, Failure) else value
+        return snapshot
+
+    @property
+    def header_page(self) -> KabuyohoWebpage:
+        """Page to read the header fields from.
+
+        A page which is already loaded is preferred, otherwise the cheapest page to fetch is loaded.
+        """
+        loaded = [name for name in HEADER_PAGES if name in vars(self)]
+        return getattr(self, (loaded or HEADER_PAGES)[0])
+
+    @property
+    def price(self) -> Money | None:
+        """Price of the stock, 価格. See header_page for the page it is read from."""
+        return self.header_page.price
+
+    @property
+    def name(self) -> str | None:
+        """Name of the stock, 銘柄名. See header_page for the page it is read from."""
+        return self.header_page.name
+
+    @property
+    def earnings_release_date(self) -> datetime | None:
+        """Earnings release date, 決算発表日. See header_page for the page it is read from."""
+        return self.header_page.earnings_release_date
+
+    @stock_page
     def report_top(self) -> ReportTop:
         """Report top page object"""
         return ReportTop(self.website, self.security_code)
 
-    @functools.cached_property
+    @stock_page
     def report_target(self) -> ReportTarget:
         """Report target page object"""
         return ReportTarget(self.website, self.security_code)
 
-    @functools.cached_property
+    @stock_page
     def report_dps(self) -> ReportDps:
         """Report DPS page object"""
         return ReportDps(self.website, self.security_code)
 
-    @functools.cached_property
+    @stock_page
     def report_news(self) -> ReportNews:
         """Report news page object"""
         return ReportNews(self.website, self.security_code)
 
-    @functools.cached_property
+    @stock_page
     def report_trend_signal(self) -> ReportTrendSignal:
         """Report trend signal page object"""
         return ReportTrendSignal(self.website, self.security_code)
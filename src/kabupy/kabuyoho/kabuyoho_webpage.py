@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import re
+import urllib.parse
 from datetime import datetime
 
 from money import Money
@@ -14,6 +15,13 @@ class KabuyohoWebpage(Webpage):
     """Base class for kabuyoho webpage"""
 
     security_code: str
+    path: str
+    """Path of the page of a stock, relative to the url of the website, e.g. "sp/reportTop"."""
+
+    @classmethod
+    def page_url(cls, website_url: str, security_code: str | int) -> str:
+        """URL of the page of a stock on a website."""
+        return urllib.parse.urljoin(website_url, f"{cls.path}?bcode={security_code}")
 
     def term2description(self, term: str) -> str:
         """Get dd text from dt text"""
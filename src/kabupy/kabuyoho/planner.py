@@ -0,0 +1,130 @@
+"""Planner of the page fetches needed for fields of many stocks"""
+from __future__ import annotations
+
+import logging
+from itertools import combinations
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from ..transport import CacheMiddleware
+from .kabuyoho import PAGE_CLASSES, Kabuyoho, Stock
+from .kabuyoho_webpage import KabuyohoWebpage
+
+logger = logging.getLogger(__name__)
+
+
+class Plan(NamedTuple):
+    """Page fetches planned by FetchPlanner.plan."""
+
+    fetches: list[tuple[str, str]]
+    """Pairs of a security code and the name of a page to load, from the network or a cached response."""
+    sources: dict[str, dict[str, str]]
+    """Name of the page each field is read from, by security code and field name."""
+
+
+class FetchPlanner:
+    """Plan the fewest page fetches which cover the requested fields of many stocks.
+
+    Pages which are loaded on the stock, or whose response is held by a CacheMiddleware of the website, are free.
+    Among the other pages, the smallest set covering the rest of the fields is fetched.
+
+    Args:
+        website (Kabuyoho): Website of the stocks.
+        pages (Mapping[str, type[KabuyohoWebpage]], optional): Page classes by Stock attribute name,
+            in the order of preference among sets of the same size. Defaults to PAGE_CLASSES.
+    """
+
+    def __init__(self, website: Kabuyoho, pages: Mapping[str, type[KabuyohoWebpage]] | None = None) -> None:
+        self.website = website
+        self.pages = dict(PAGE_CLASSES if pages is None else pages)
+        self.fields: dict[str, list[str]] = {}
+        """Names of the pages having each field, by field name."""
+        for page, cls in self.pages.items():
+            for field in cls.webpage_properties():
+                self.fields.setdefault(field, []).append(page)
+
+    def is_cached(self, stock: Stock, page: str) -> bool:
+        """True if the page of the stock is available without a request."""
+        if page in vars(stock):
+            return True
+        if page not in self.pages:
+            return False
+        url = self.pages[page].page_url(self.website.url, stock.security_code)
+        return any(url in m.responses for m in self.website.middlewares if isinstance(m, CacheMiddleware))
+
+    def cover(self, fields: Iterable[str], cached: Iterable[str] = ()) -> dict[str, str]:
+        """Choose the page of each field, requesting as few pages as possible.
+
+        Args:
+            fields (Iterable[str]): Field names.
+            cached (Iterable[str], optional): Names of the pages available without a request.
+
+        Returns:
+            dict[str, str]: Name of the page by field name.
+
+        Raises:
+            ValueError: If a field is not on any page.
+        """
+        fields = list(dict.fromkeys(fields))
+        unknown = [field for field in fields if field not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        cached = [page for page in self.pages if page in set(cached)]
+        candidates = [page for page in self.pages if page not in cached]
+        # There are only a few pages, so the exact set cover is found by trying the smaller sets first.
+        for size in range(len(candidates) + 1):
+            for chosen in combinations(candidates, size):
+                available = cached + list(chosen)
+                if all(any(page in available for page in self.fields[field]) for field in fields):
+                    return {field: next(p for p in available if p in self.fields[field]) for field in fields}
+        raise AssertionError("All pages cover all fields")  # pragma: no cover
+
+    def plan(self, fields: Iterable[str], security_codes: Iterable[str | int]) -> Plan:
+        """Plan the page fetches for the fields of the stocks."""
+        return self._plan(fields, [self.website.stock(code) for code in security_codes])
+
+    def _plan(self, fields: Iterable[str], stocks: Iterable[Stock]) -> Plan:
+        fields = list(fields)
+        fetches: list[tuple[str, str]] = []
+        sources: dict[str, dict[str, str]] = {}
+        for stock in stocks:
+            cached = [page for page in self.pages if self.is_cached(stock, page)]
+            sources[stock.security_code] = self.cover(fields, cached)
+            fetches.extend(
+                (stock.security_code, page)
+                for page in dict.fromkeys(sources[stock.security_code].values())
+                if page not in vars(stock)
+            )
+        return Plan(fetches, sources)
+
+    def query(
+        self, fields: Iterable[str], security_codes: Iterable[str | int], max_workers: int | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch the planned pages concurrently and read the fields.
+
+        A field whose page failed to load, or whose value could not be read, is left out and logged.
+
+        Args:
+            fields (Iterable[str]): Field names, e.g. ``["price", "expected_dividend_yield"]``.
+            security_codes (Iterable[str | int]): Security codes of the stocks.
+            max_workers (int | None, optional): Number of worker threads. See Kabuyoho.fetch_pages.
+
+        Returns:
+            dict[str, dict[str, Any]]: Values by security code and field name.
+        """
+        stocks = {stock.security_code: stock for stock in map(self.website.stock, security_codes)}
+        plan = self._plan(fields, stocks.values())
+        stock_pages = [(stocks[code], page) for code, page in plan.fetches]
+        for _ in self.website.fetch_stock_pages(stock_pages, max_workers):
+            pass
+        values: dict[str, dict[str, Any]] = {}
+        for code, sources in plan.sources.items():
+            stock = stocks[code]
+            values[code] = {}
+            for field, page in sources.items():
+                if page not in vars(stock):
+                    continue
+                try:
+                    values[code][field] = getattr(vars(stock)[page], field)
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.warning("Failed to read %s of %s: %s", field, code, ex)
+        return values
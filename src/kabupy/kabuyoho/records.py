@@ -0,0 +1,43 @@
+"""Compact record types of kabuyoho results"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from money import Money
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class NewsItem(NamedTuple):
+    """News item of a news page."""
+
+    date: datetime
+    title: str
+    category: str
+    weather: str | None
+    """Class of the weather icon, e.g. "wthr_clud", None if there is no icon."""
+    url: str
+
+
+class Dividend(NamedTuple):
+    """Dividend per share of a fiscal year."""
+
+    date: datetime
+    dividend: Money | None
+
+
+def records_to_frame(records: Iterable[NamedTuple], record_type: type) -> pd.DataFrame:
+    """Convert records to a DataFrame with a column per field of record_type.
+
+    Money values are converted to their float amounts, so that the columns are numeric.
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    frame = pd.DataFrame.from_records(list(records), columns=list(record_type._fields))
+    for column, dtype in frame.dtypes.items():
+        if dtype == object and frame[column].map(lambda v: isinstance(v, Money)).any():
+            frame[column] = frame[column].map(lambda v: float(v.amount) if isinstance(v, Money) else None)
+            frame[column] = frame[column].astype("float64")
+    return frame
@@ -3,12 +3,12 @@ from __future__ import annotations
 
 import logging
 import re
-import urllib.parse
 from datetime import datetime
 
 from ..base import Website, webpage_property
 from ..util import str2float, str2money
 from .kabuyoho_webpage import KabuyohoWebpage
+from .records import Dividend
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +16,14 @@ logger = logging.getLogger(__name__)
 class ReportDps(KabuyohoWebpage):
     """Report target page object."""
 
+    path = "sp/reportDps"
+    _records: list[Dividend] = []
+    _records_digest: str | None = None
+
     def __init__(self, website: Website, security_code: str | int) -> None:
         self.website = website
         self.security_code = str(security_code)
-        self.url = urllib.parse.urljoin(self.website.url, f"sp/reportDps?bcode={self.security_code}")
+        self.url = self.page_url(self.website.url, self.security_code)
         super().__init__()
 
     @webpage_property
@@ -38,13 +42,30 @@ class ReportDps(KabuyohoWebpage):
         {"date": datetime(2024, 3, 1), "dividend": None},
         ]
         """
-        dates = self.select("h2:-soup-contains('一株配当推移') + div > table > tbody th")
-        dates = [datetime.strptime(re.sub(r"[\D]", "", d.text), "%Y%m") for d in dates]
-        dividends = self.select("h2:-soup-contains('一株配当推移') + div > table > tbody td")
-        dividends = [str2money(d.text) for d in dividends]
-        res = [{"date": date, "dividend": dividend} for date, dividend in zip(dates, dividends)]
-        res.sort(key=lambda x: x["date"])
-        return res
+        return [record._asdict() for record in self._dividend_records()]
+
+    @property
+    def dividend_history_records(self) -> list[Dividend]:
+        """Dividend history(一株配当推移) as compact records, sorted by date."""
+        return list(self._dividend_records())
+
+    def _dividend_records(self) -> list[Dividend]:
+        """Dividend history parsed into records, once per content of the webpage.
+
+        If the content was released before the records were parsed, they are built from the memoized dicts.
+        """
+        if self._records_digest == self.digest:
+            return self._records
+        if self._body is None and isinstance(self.values.get("dividend_history"), list):
+            records = [Dividend(**item) for item in self.values["dividend_history"]]
+        else:
+            dates = self.select("h2:-soup-contains('一株配当推移') + div > table > tbody th")
+            dates = [datetime.strptime(re.sub(r"[\D]", "", d.text), "%Y%m") for d in dates]
+            dividends = self.select("h2:-soup-contains('一株配当推移') + div > table > tbody td")
+            dividends = [str2money(d.text) for d in dividends]
+            records = sorted(map(Dividend, dates, dividends), key=lambda x: x.date)
+        self._records, self._records_digest = records, self.digest
+        return records
 
     @webpage_property
     def actual_dividend_yield(self) -> float | None:
@@ -1,20 +1,26 @@
 """Scraper for https://kabuyoho.jp/sp/reportDps"""
 from __future__ import annotations
 
-import functools
 import logging
 import re
 import time
 import urllib.parse
 from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, Mapping, Sequence
 
-from ..base import Website
+from ..base import Website, cached_property
 from ..constants import TIME_SLEEP
 from ..errors import ElementNotFoundError
 from .kabuyoho_webpage import KabuyohoWebpage
+from .records import NewsItem
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+REPORTS = ("market_report", "flash_report", "analyst_prediction", "analyst_evaluation")
+
 
 class ReportNews(KabuyohoWebpage):
     """Report news page object."""
@@ -26,22 +32,53 @@ class ReportNews(KabuyohoWebpage):
         # No need to call super().__init__() because this class does not have any webpage property.
         super().__init__(load=False)
 
-    @functools.cached_property
+    def reload(self) -> bool:
+        """Reload the loaded news pages in place. Return True if any of them changed."""
+        changed = False
+        for page in [v for v in vars(self).values() if isinstance(v, KabuyohoNewsWebpage)]:
+            changed = page.reload() or changed
+        return changed
+
+    def get_links_frame(self, max_page: int | None = 1, time_sleep: float = TIME_SLEEP) -> pd.DataFrame:
+        """links of all the news categories as a DataFrame.
+
+        Args:
+            max_page (int | None, optional): Max page number per category. Defaults to 1.
+                If None, all pages are scraped.
+
+        Returns:
+            pd.DataFrame: Columns of KabuyohoNewsWebpage.get_links_frame and a categorical report
+            column holding the category, e.g. "market_report".
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        frames = []
+        for report in REPORTS:
+            frame = getattr(self, report).get_links_frame(max_page, time_sleep)
+            frame.insert(0, "report", report)
+            frames.append(frame)
+        combined = pd.concat(frames, ignore_index=True)
+        combined["report"] = pd.Categorical(combined["report"], categories=REPORTS)
+        for column in ("category", "weather"):
+            combined[column] = combined[column].astype("category")
+        return combined
+
+    @cached_property
     def market_report(self) -> KabuyohoNewsWebpage:
         """Market report page in a report news page."""
         return KabuyohoNewsWebpage(self.website, self.security_code, 1)
 
-    @functools.cached_property
+    @cached_property
     def flash_report(self) -> KabuyohoNewsWebpage:
         """Flash report page in a report news page."""
         return KabuyohoNewsWebpage(self.website, self.security_code, 2)
 
-    @functools.cached_property
+    @cached_property
     def analyst_prediction(self) -> KabuyohoNewsWebpage:
         """Analyst prediction page in a report news page."""
         return KabuyohoNewsWebpage(self.website, self.security_code, 3)
 
-    @functools.cached_property
+    @cached_property
     def analyst_evaluation(self) -> KabuyohoNewsWebpage:
         """Analyst evaluation page in a report news page."""
         return KabuyohoNewsWebpage(self.website, self.security_code, 4)
@@ -99,18 +136,12 @@ class KabuyohoNewsWebpage(KabuyohoWebpage):
                 ]
 
         """
-        res = []
-        if not self.has_links():
-            return res
-        if max_page is None:
-            max_page = self.get_max_page()
-        else:
-            max_page = min(max_page, self.get_max_page())
-        for _page in range(1, max_page + 1):
-            if _page > 1:
-                time.sleep(time_sleep)
-                self.url = self.url + f"&page={_page}"
-                self.load()
+        return [item._asdict() for item in self.get_link_records(max_page, time_sleep)]
+
+    def get_link_records(self, max_page: int | None = 1, time_sleep: float = TIME_SLEEP) -> list[NewsItem]:
+        """list of links as compact records. See get_links for the arguments."""
+        res: list[NewsItem] = []
+        for _ in self._iter_pages(max_page, time_sleep):
             dates = self.select("div.sp_news_list > ul span.time")
             dates = [datetime.strptime(re.sub(r"[\D]", "", d.text), "%Y%m%d%H%M") for d in dates]
             titles = self.select("div.sp_news_list > ul p.list_title")
@@ -124,8 +155,79 @@ class KabuyohoNewsWebpage(KabuyohoWebpage):
             urls = self.select("div.sp_news_list > ul a")
             urls = [u.get("href") for u in urls]
             urls = [urllib.parse.urljoin(self.website.url, u) for u in urls if isinstance(u, str)]
-            res = res + [
-                {"date": date, "title": title, "category": category, "weather": weather, "url": url}
-                for date, title, category, weather, url in zip(dates, titles, categories, weathers, urls)
-            ]
+            res.extend(map(NewsItem, dates, titles, categories, weathers, urls))
         return res
+
+    def get_links_frame(self, max_page: int | None = 1, time_sleep: float = TIME_SLEEP) -> pd.DataFrame:
+        """links as a DataFrame. See get_links for the arguments.
+
+        The raw strings of all pages are collected first and parsed column-wise, so that the dates,
+        weathers and categories are converted once instead of per news item.
+
+        Returns:
+            pd.DataFrame: Columns are date (datetime64), title, category (categorical),
+            weather (categorical) and url.
+        """
+        columns: dict[str, list[str]] = {field: [] for field in NewsItem._fields}
+        for _ in self._iter_pages(max_page, time_sleep):
+            page: dict[str, list[str]] = {field: [] for field in NewsItem._fields}
+            for tag in self.soup.select(NEWS_SELECTOR):
+                classes = tag.get_attribute_list("class")
+                if tag.name == "a":
+                    href = tag.get("href")
+                    if isinstance(href, str):
+                        page["url"].append(urllib.parse.urljoin(self.website.url, href))
+                elif tag.name == "p":
+                    page["title"].append(tag.text)
+                elif "time" in classes:
+                    page["date"].append(tag.text)
+                elif "ctgr" in classes:
+                    page["category"].append(tag.text)
+                else:
+                    page["weather"].append(" ".join(classes))
+            # Truncate to the shortest column per page, as get_link_records does with map.
+            length = min(len(values) for values in page.values())
+            for field, values in page.items():
+                columns[field].extend(values[:length])
+        return news_frame(columns)
+
+    def _iter_pages(self, max_page: int | None, time_sleep: float) -> Iterator[int]:
+        """Load the news pages one by one and yield their page numbers."""
+        if not self.has_links():
+            return
+        if max_page is None:
+            max_page = self.get_max_page()
+        else:
+            max_page = min(max_page, self.get_max_page())
+        for _page in range(1, max_page + 1):
+            if _page > 1:
+                time.sleep(time_sleep)
+                self.url = self.url + f"&page={_page}"
+                self.load()
+            yield _page
+
+
+NEWS_SELECTOR = ", ".join(
+    f"div.sp_news_list > ul {selector}" for selector in ("span.time", "p.list_title", "span.ctgr", "span.wthr", "a")
+)
+"""Selector of all the columns of a news list, matched in a single pass in document order."""
+
+
+def news_frame(columns: Mapping[str, Sequence[str]]) -> pd.DataFrame:
+    """Parse raw news columns into a typed DataFrame.
+
+    Args:
+        columns (Mapping[str, Sequence[str]]): Raw strings per NewsItem field. Weathers are the
+            space-separated classes of the weather icons.
+
+    Returns:
+        pd.DataFrame: News with a column per NewsItem field.
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    frame = pd.DataFrame({field: pd.Series(columns[field], dtype=object) for field in NewsItem._fields})
+    frame["date"] = pd.to_datetime(frame["date"].str.replace(r"\D", "", regex=True), format="%Y%m%d%H%M")
+    frame["category"] = frame["category"].astype("category")
+    weather = frame["weather"].str.replace(r"(?<!\S)wthr(?!\S)", "", regex=True).str.split().str[0]
+    frame["weather"] = weather.astype("category")
+    return frame
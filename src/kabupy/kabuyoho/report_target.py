@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import logging
 import re
-import urllib.parse
 
 from money import Money
 
@@ -17,10 +16,12 @@ logger = logging.getLogger(__name__)
 class ReportTarget(KabuyohoWebpage):
     """Report target page object."""
 
+    path = "sp/reportTarget"
+
     def __init__(self, website: Website, security_code: str | int) -> None:
         self.website = website
         self.security_code = str(security_code)
-        self.url = urllib.parse.urljoin(self.website.url, f"sp/reportTarget?bcode={self.security_code}")
+        self.url = self.page_url(self.website.url, self.security_code)
         super().__init__()
 
     # Properties in "price target, 目標株価."
@@ -17,10 +17,12 @@ logger = logging.getLogger(__name__)
 class ReportTop(KabuyohoWebpage):
     """Report target page object."""
 
+    path = "sp/reportTop"
+
     def __init__(self, website: Website, security_code: str | int) -> None:
         self.website = website
         self.security_code = str(security_code)
-        self.url = urllib.parse.urljoin(self.website.url, f"sp/reportTop?bcode={self.security_code}")
+        self.url = self.page_url(self.website.url, self.security_code)
         super().__init__()
 
     @webpage_property
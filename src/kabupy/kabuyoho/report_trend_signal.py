@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import logging
 import re
-import urllib.parse
 
 from ..base import Website, webpage_property
 from ..errors import ElementNotFoundError
@@ -16,10 +15,12 @@ logger = logging.getLogger(__name__)
 class ReportTrendSignal(KabuyohoWebpage):
     """Report target page object."""
 
+    path = "sp/reportTrendSignal"
+
     def __init__(self, website: Website, security_code: str | int) -> None:
         self.website = website
         self.security_code = str(security_code)
-        self.url = urllib.parse.urljoin(self.website.url, f"sp/reportTrendSignal?bcode={self.security_code}")
+        self.url = self.page_url(self.website.url, self.security_code)
         super().__init__()
 
     @webpage_property
@@ -0,0 +1,183 @@
+"""Vectorized screening and ranking of stocks over snapshot DataFrames"""
+from __future__ import annotations
+
+import operator
+import re
+from typing import Callable, Iterable, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..store.timeseries import flatten, to_column
+from .kabuyoho import Stock
+
+PRICE_FIELDS = ("report_target.price", "report_top.price", "report_dps.price", "report_trend_signal.price")
+"""Fields of the price, in the order they are used when more than one is present."""
+
+RATINGS = ("1", "2", "3", "4", "5")
+"""Keys of analyst_rating_composition, from strong sell to strong buy."""
+
+OPERATORS: dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_PREDICATE = re.compile(r"^\s*(\S+?)\s*(<=|>=|==|!=|<|>)\s*(\S+)\s*$")
+
+
+class Predicate(NamedTuple):
+    """Comparison of a field with a value, e.g. ``Predicate("report_top.expected_per", "<", 15)``."""
+
+    field: str
+    comparison: str
+    """One of "<", "<=", ">", ">=", "==" and "!="."""
+    value: float
+
+    @classmethod
+    def parse(cls, text: str) -> Predicate:
+        """Parse a predicate like "expected_per < 15"."""
+        match = _PREDICATE.match(text)
+        if match is None:
+            raise ValueError(f"Invalid predicate: {text!r}")
+        field, comparison, value = match.groups()
+        return cls(field, comparison, float(value))
+
+
+def snapshot_frame(stocks: Iterable[Stock]) -> pd.DataFrame:
+    """Snapshots of stocks as a DataFrame indexed by security code, with a column per flattened field.
+
+    Fields are converted as in TimeSeriesStore, so Money becomes float and lists are skipped.
+    """
+    snapshots = {stock.security_code: flatten(stock.snapshot()) for stock in stocks}
+    codes = list(snapshots)
+    fields = sorted({field for snapshot in snapshots.values() for field in snapshot})
+    columns = {}
+    for field in fields:
+        values = to_column([snapshots[code].get(field) for code in codes])
+        if values is not None:
+            columns[field] = values
+    return pd.DataFrame(columns, index=pd.Index(codes, name="security_code"))
+
+
+def column(frame: pd.DataFrame, field: str) -> np.ndarray:
+    """Values of a field as a float array, NaN where missing.
+
+    Args:
+        frame (pd.DataFrame): Snapshot DataFrame.
+        field (str): Column name, or the name of a property if exactly one column ends with it,
+            e.g. "expected_per" for "report_top.expected_per".
+
+    Raises:
+        KeyError: If the field is missing or ambiguous.
+    """
+    if field not in frame.columns:
+        matches = [name for name in frame.columns if name.endswith(f".{field}")]
+        if len(matches) != 1:
+            raise KeyError(f"{field} matches {len(matches)} columns")
+        field = matches[0]
+    return frame[field].to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _first_present(frame: pd.DataFrame, fields: Iterable[str]) -> np.ndarray:
+    result = np.full(len(frame), np.nan)
+    for field in fields:
+        if field in frame.columns:
+            values = frame[field].to_numpy(dtype="float64", na_value=np.nan)
+            result = np.where(np.isnan(result), values, result)
+    return result
+
+
+def _optional(frame: pd.DataFrame, field: str) -> np.ndarray:
+    if field in frame.columns:
+        return frame[field].to_numpy(dtype="float64", na_value=np.nan)
+    return np.full(len(frame), np.nan)
+
+
+def derive_metrics(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add derived metrics to a snapshot DataFrame.
+
+    Added columns are:
+        price: The first present of PRICE_FIELDS.
+        upside: Ratio of report_target.price_target to the price, minus 1.
+        per_fair_value_gap: Ratio of report_target.per_based_fair_value to the price, minus 1.
+        pbr_fair_value_gap: Ratio of report_target.pbr_based_fair_value to the price, minus 1.
+        fair_value_gap: Mean of the two fair value gaps which are present.
+        rating_count: Number of analysts in report_target.analyst_rating_composition.
+        rating_mean: Mean rating, from 1 (strong sell) to 5 (strong buy).
+        rating_std: Standard deviation of the ratings.
+        rating_bullish_share: Share of the ratings 4 and 5.
+
+    Returns:
+        pd.DataFrame: A copy of frame with the derived columns. Missing inputs give NaN.
+    """
+    frame = frame.copy()
+    price = _first_present(frame, PRICE_FIELDS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame["price"] = price
+        frame["upside"] = _optional(frame, "report_target.price_target") / price - 1
+        per_gap = _optional(frame, "report_target.per_based_fair_value") / price - 1
+        pbr_gap = _optional(frame, "report_target.pbr_based_fair_value") / price - 1
+        frame["per_fair_value_gap"] = per_gap
+        frame["pbr_fair_value_gap"] = pbr_gap
+        gaps = np.stack([per_gap, pbr_gap])
+        present = (~np.isnan(gaps)).sum(axis=0)
+        frame["fair_value_gap"] = np.where(present > 0, np.nansum(gaps, axis=0) / present, np.nan)
+        counts = np.stack([_optional(frame, f"report_target.analyst_rating_composition.{r}") for r in RATINGS])
+        scores = np.array([float(r) for r in RATINGS])[:, None]
+        total = counts.sum(axis=0)
+        mean = (counts * scores).sum(axis=0) / total
+        frame["rating_count"] = total
+        frame["rating_mean"] = mean
+        frame["rating_std"] = np.sqrt((counts * (scores - mean) ** 2).sum(axis=0) / total)
+        frame["rating_bullish_share"] = (counts[3] + counts[4]) / total
+    return frame
+
+
+def mask(frame: pd.DataFrame, predicates: Sequence[Predicate | str]) -> np.ndarray:
+    """Boolean array of the rows satisfying all predicates. A missing value never satisfies a predicate."""
+    result = np.ones(len(frame), dtype=bool)
+    for predicate in predicates:
+        if isinstance(predicate, str):
+            predicate = Predicate.parse(predicate)
+        if predicate.comparison not in OPERATORS:
+            raise ValueError(f"Invalid operator: {predicate.comparison!r}")
+        values = column(frame, predicate.field)
+        result &= OPERATORS[predicate.comparison](values, predicate.value) & ~np.isnan(values)
+    return result
+
+
+def screen(
+    frame: pd.DataFrame,
+    predicates: Sequence[Predicate | str] = (),
+    rank_by: str = "fair_value_gap",
+    k: int | None = None,
+    ascending: bool = False,
+) -> pd.DataFrame:
+    """Filter a snapshot DataFrame by predicates and rank the rows.
+
+    Derived metrics (see derive_metrics) are added first, so they can be used in predicates and for ranking.
+
+    Args:
+        frame (pd.DataFrame): Snapshot DataFrame, e.g. from snapshot_frame or TimeSeriesStore.frame.
+        predicates (Sequence[Predicate | str], optional): Predicates, e.g. ``["expected_per < 15", "upside > 0.2"]``.
+        rank_by (str, optional): Field to rank by. Defaults to "fair_value_gap", the most undervalued first.
+        k (int | None, optional): Number of rows to return. Defaults to None, which means all.
+        ascending (bool, optional): Rank the smallest values first. Defaults to False.
+
+    Returns:
+        pd.DataFrame: Matching rows in rank order. Rows whose rank_by value is missing come last.
+    """
+    frame = derive_metrics(frame)
+    frame = frame.loc[mask(frame, predicates)]
+    keys = column(frame, rank_by)
+    keys = np.where(np.isnan(keys), np.inf, keys if ascending else -keys)
+    if k is not None and k < len(keys):
+        top = np.argpartition(keys, k - 1)[:k] if k > 0 else np.array([], dtype=np.intp)
+        order = top[np.argsort(keys[top], kind="stable")]
+    else:
+        order = np.argsort(keys, kind="stable")
+    return frame.iloc[order]
@@ -0,0 +1,20 @@
+"""kabupy.store module."""
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .snapshot_store import Change, SnapshotStore, diff_snapshots
+from .value_store import PARSER_VERSION, ValueStore
+
+if TYPE_CHECKING:
+    from .timeseries import TimeSeriesStore
+
+__all__ = ["PARSER_VERSION", "Change", "SnapshotStore", "TimeSeriesStore", "ValueStore", "diff_snapshots"]
+
+
+def __getattr__(name: str) -> Any:
+    # TimeSeriesStore needs numpy and pandas, so it is imported on first access.
+    if name == "TimeSeriesStore":
+        return importlib.import_module(".timeseries", __name__).TimeSeriesStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,102 @@
+"""Store of the latest snapshots of stocks, and the changes between snapshots."""
+from __future__ import annotations
+
+import math
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Any, Mapping, NamedTuple
+
+
+def _is_nan(value: Any) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+class Change(NamedTuple):
+    """Change of a field of a stock between two snapshots."""
+
+    security_code: str
+    field: str
+    """Name of the field, e.g. "report_top.signal"."""
+    old: Any
+    """Previous value, None if the field was missing."""
+    new: Any
+
+
+def diff_snapshots(security_code: str, old: Mapping[str, Any], new: Mapping[str, Any]) -> list[Change]:
+    """Changes of the fields of a new snapshot from an old one.
+
+    Fields missing from the new snapshot are not compared, so a partial snapshot only reports its own fields.
+    """
+    changes = []
+    for field, value in new.items():
+        previous = old.get(field)
+        if previous != value and not (_is_nan(previous) and _is_nan(value)):
+            changes.append(Change(security_code, field, previous, value))
+    return changes
+
+
+class SnapshotStore:
+    """SQLite store of the latest snapshot of each stock, keyed by security code.
+
+    Args:
+        path (str | os.PathLike): Path to the SQLite database. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots (security_code TEXT PRIMARY KEY, data BLOB NOT NULL)"
+            )
+
+    def __enter__(self) -> SnapshotStore:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM snapshots").fetchone()
+        return count
+
+    def get(self, security_code: str) -> dict[str, Any] | None:
+        """Return the stored snapshot of a stock, or None if there is none."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM snapshots WHERE security_code = ?", (security_code,)
+            ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def put(self, security_code: str, snapshot: Mapping[str, Any]) -> None:
+        """Store the snapshot of a stock, replacing the previous one."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots (security_code, data) VALUES (?, ?)",
+                (security_code, pickle.dumps(dict(snapshot))),
+            )
+
+    def update(self, security_code: str, snapshot: Mapping[str, Any]) -> list[Change]:
+        """Merge a new snapshot of a stock into the stored one, and return the changes.
+
+        A stock which was never stored reports all its fields as changed from None.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT data FROM snapshots WHERE security_code = ?", (security_code,)
+            ).fetchone()
+            old = {} if row is None else pickle.loads(row[0])
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots (security_code, data) VALUES (?, ?)",
+                (security_code, pickle.dumps({**old, **snapshot})),
+            )
+        return diff_snapshots(security_code, old, snapshot)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,176 @@
+"""Columnar store of daily snapshots of stocks."""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+from money import Money
+
+CODES_FILE = "_codes.npy"
+"""Name of the file holding the sorted security codes of a partition."""
+
+
+def to_column(values: list[Any]) -> np.ndarray | None:
+    """Convert the values of a field to an array which can be memory-mapped, or None if they cannot.
+
+    Numbers, bools and Money are stored as float64, bools as 1.0 and 0.0, datetimes as datetime64[s]
+    and strings as fixed-width unicode. Missing values are NaN, NaT and "" respectively.
+    """
+    present = [value for value in values if value is not None]
+    if not present:
+        return None
+    if all(isinstance(value, (int, float, Money)) for value in present):
+        return np.array(
+            [np.nan if v is None else float(v.amount) if isinstance(v, Money) else v for v in values],
+            dtype="float64",
+        )
+    if all(isinstance(value, datetime) for value in present):
+        return np.array(["NaT" if v is None else v for v in values], dtype="datetime64[s]")
+    if all(isinstance(value, str) for value in present):
+        return np.array(["" if v is None else v for v in values], dtype=str)
+    return None
+
+
+def flatten(snapshot: Mapping[str, Any]) -> dict[str, Any]:
+    """Flatten dict values of a snapshot into a field per key, e.g. "report_target.analyst_rating_composition.5"."""
+    flat = {}
+    for field, value in snapshot.items():
+        if isinstance(value, Mapping):
+            flat.update((f"{field}.{key}", item) for key, item in value.items())
+        else:
+            flat[field] = value
+    return flat
+
+
+class TimeSeriesStore:
+    """Daily snapshots of stocks, stored as columnar partitions of .npy files.
+
+    Every day is a directory (``<directory>/<YYYY-MM-DD>``) with the sorted security codes and one file per field.
+    Reads memory-map the files, so a range query only touches the rows and columns it asks for.
+
+    Args:
+        directory (str | os.PathLike): Directory of the partitions. It is created if it does not exist.
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def append(self, day: date, snapshots: Mapping[str, Mapping[str, Any]]) -> None:
+        """Store the snapshots of a day, replacing the partition of the day if it exists.
+
+        Dict values are flattened (see flatten). Bools are stored as 1.0 and 0.0 (see to_column).
+        Fields whose values are neither numbers, bools, datetimes nor strings, e.g. lists, are skipped.
+
+        Args:
+            day (date): Day of the snapshots.
+            snapshots (Mapping[str, Mapping[str, Any]]): Snapshots by security code, e.g. from Stock.snapshot.
+        """
+        snapshots = {code: flatten(snapshot) for code, snapshot in snapshots.items()}
+        codes = sorted(snapshots)
+        fields = sorted({field for snapshot in snapshots.values() for field in snapshot})
+        partition = self._partition(day)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.directory)
+        try:
+            np.save(os.path.join(staging, CODES_FILE), np.array(codes, dtype=str))
+            for field in fields:
+                column = to_column([snapshots[code].get(field) for code in codes])
+                if column is not None:
+                    np.save(os.path.join(staging, f"{field}.npy"), column)
+            if os.path.exists(partition):
+                shutil.rmtree(partition)
+            os.replace(staging, partition)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def days(self, start: date | None = None, end: date | None = None) -> list[date]:
+        """Days stored between start and end, both inclusive."""
+        days = []
+        for name in os.listdir(self.directory):
+            try:
+                day = date.fromisoformat(name)
+            except ValueError:
+                continue
+            if (start is None or day >= start) and (end is None or day <= end):
+                days.append(day)
+        return sorted(days)
+
+    def fields(self, day: date) -> list[str]:
+        """Fields stored on a day."""
+        names = os.listdir(self._partition(day))
+        return sorted(name[: -len(".npy")] for name in names if name.endswith(".npy") and name != CODES_FILE)
+
+    def query(
+        self,
+        fields: Iterable[str],
+        security_codes: Iterable[str | int] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> pd.DataFrame:
+        """Read fields of stocks over a range of days.
+
+        Args:
+            fields (Iterable[str]): Fields, e.g. ``["report_top.expected_per", "report_top.actual_roe"]``.
+            security_codes (Iterable[str | int] | None, optional): Security codes. Defaults to None, which means all.
+            start (date | None, optional): First day, inclusive. Defaults to None, which means the first stored day.
+            end (date | None, optional): Last day, inclusive. Defaults to None, which means the last stored day.
+
+        Returns:
+            pd.DataFrame: A row per day and stock with columns date, security_code and the fields.
+                A field which is not stored on a day is missing (NaN) there.
+        """
+        fields = list(fields)
+        wanted = None if security_codes is None else np.unique(np.array([str(c) for c in security_codes], dtype=str))
+        frames = []
+        for day in self.days(start, end):
+            codes, columns = self._read(day, fields, wanted)
+            frame = pd.DataFrame({"date": np.full(len(codes), np.datetime64(day, "ns")), "security_code": codes})
+            for field in fields:
+                frame[field] = columns[field] if field in columns else np.nan
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["date", "security_code", *fields])
+        return pd.concat(frames, ignore_index=True)
+
+    def frame(self, day: date, fields: Iterable[str] | None = None) -> pd.DataFrame:
+        """Snapshots of a day, indexed by security code.
+
+        Args:
+            day (date): Day of the snapshots.
+            fields (Iterable[str] | None, optional): Fields. Defaults to None, which means all stored fields.
+        """
+        fields = self.fields(day) if fields is None else list(fields)
+        codes, columns = self._read(day, fields, None)
+        return pd.DataFrame(
+            {field: columns.get(field, np.nan) for field in fields}, index=pd.Index(codes, name="security_code")
+        )
+
+    def _partition(self, day: date) -> str:
+        return os.path.join(self.directory, day.isoformat())
+
+    def _read(
+        self, day: date, fields: list[str], wanted: np.ndarray | None
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        partition = self._partition(day)
+        codes = np.load(os.path.join(partition, CODES_FILE), mmap_mode="r")
+        if wanted is None:
+            rows = slice(None)
+        else:
+            # Codes of a partition are sorted, so the rows are found by binary search.
+            if len(codes) == 0:
+                rows = np.array([], dtype=np.intp)
+            else:
+                positions = np.minimum(np.searchsorted(codes, wanted), len(codes) - 1)
+                rows = positions[codes[positions] == wanted]
+        columns = {}
+        for field in fields:
+            path = os.path.join(partition, f"{field}.npy")
+            if os.path.exists(path):
+                columns[field] = np.asarray(np.load(path, mmap_mode="r")[rows])
+        return np.asarray(codes[rows]), columns
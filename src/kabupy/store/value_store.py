@@ -0,0 +1,92 @@
+"""Store of the extracted values of webpages keyed by their content."""
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Any, Mapping
+
+PARSER_VERSION = "1"
+"""Version of the webpage parsers. Bump it when a webpage property changes, so stored values are not reused."""
+
+
+class ValueStore:
+    """SQLite store mapping (page class, SHA-256 of the content) to the extracted webpage property values.
+
+    When a webpage is fetched with a body which was stored before, its values are restored from the store
+    and the body is parsed only if a property which was not stored is accessed.
+    Entries of another version are ignored, and dropped by purge().
+
+    Args:
+        path (str | os.PathLike): Path to the SQLite database. It is created if it does not exist.
+        version (str, optional): Version key of the entries. Defaults to PARSER_VERSION.
+    """
+
+    def __init__(self, path: str | os.PathLike, version: str = PARSER_VERSION) -> None:
+        self.path = os.fspath(path)
+        self.version = version
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS page_values ("
+                "page TEXT NOT NULL, digest TEXT NOT NULL, version TEXT NOT NULL, data BLOB NOT NULL, "
+                "PRIMARY KEY (page, digest, version))"
+            )
+
+    def __enter__(self) -> ValueStore:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM page_values WHERE version = ?", (self.version,)
+            ).fetchone()
+        return count
+
+    def get(self, page: str, digest: str) -> dict[str, Any] | None:
+        """Return the values stored for a page class and content digest, or None if there are none.
+
+        Args:
+            page (str): Qualified name of the page class.
+            digest (str): SHA-256 hex digest of the content.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM page_values WHERE page = ? AND digest = ? AND version = ?",
+                (page, digest, self.version),
+            ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def put(self, page: str, digest: str, values: Mapping[str, Any]) -> None:
+        """Store the values of a page class and content digest, replacing any stored before.
+
+        Values which cannot be pickled and unpickled, e.g. some errors, are left out.
+        """
+        data = {}
+        for name, value in values.items():
+            try:
+                pickle.loads(pickle.dumps(value))
+            except Exception:  # pylint: disable=broad-except
+                continue
+            data[name] = value
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO page_values (page, digest, version, data) VALUES (?, ?, ?, ?)",
+                (page, digest, self.version, pickle.dumps(data)),
+            )
+
+    def purge(self) -> int:
+        """Delete the entries of other versions. Return the number of deleted entries."""
+        with self._lock, self._connection:
+            cursor = self._connection.execute("DELETE FROM page_values WHERE version != ?", (self.version,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
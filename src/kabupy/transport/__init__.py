@@ -0,0 +1,42 @@
+"""kabupy.transport module."""
+from __future__ import annotations
+
+from .base import Request, RequestsTransport, Response, Transport
+from .breaker import CircuitBreakerMiddleware
+from .cache import CacheMiddleware
+from .cassette import CassetteTransport
+from .concurrency import THROTTLE_STATUSES, AdaptiveConcurrencyMiddleware
+from .latency import AdaptiveTimeoutMiddleware, HedgingMiddleware, LatencyTracker, page_type
+from .metrics import MetricsMiddleware
+from .middleware import Handler, Middleware, build_handler
+from .ratelimit import RateLimitMiddleware
+from .record import ArchiveMiddleware, ArchiveTransport, RecordMiddleware
+from .retry import RETRY_ERRORS, RETRY_STATUSES, RetryMiddleware, parse_retry_after
+
+__all__ = [
+    "RETRY_ERRORS",
+    "RETRY_STATUSES",
+    "THROTTLE_STATUSES",
+    "AdaptiveConcurrencyMiddleware",
+    "AdaptiveTimeoutMiddleware",
+    "ArchiveMiddleware",
+    "ArchiveTransport",
+    "CacheMiddleware",
+    "CassetteTransport",
+    "CircuitBreakerMiddleware",
+    "Handler",
+    "HedgingMiddleware",
+    "LatencyTracker",
+    "MetricsMiddleware",
+    "Middleware",
+    "RateLimitMiddleware",
+    "RecordMiddleware",
+    "Request",
+    "RequestsTransport",
+    "Response",
+    "RetryMiddleware",
+    "Transport",
+    "build_handler",
+    "page_type",
+    "parse_retry_after",
+]
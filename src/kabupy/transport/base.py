@@ -0,0 +1,95 @@
+"""Transport interface for fetching webpages"""
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Mapping
+
+import requests
+from requests.compat import chardet
+from requests.structures import CaseInsensitiveDict
+
+from ..util import tracing
+
+
+@dataclass
+class Request:
+    """HTTP GET request sent through a transport."""
+
+    url: str
+    headers: dict[str, str] = field(default_factory=dict)
+    timeout: float = 10
+
+
+@dataclass
+class Response:
+    """HTTP response returned by a transport."""
+
+    url: str
+    status_code: int
+    content: bytes
+    headers: Mapping[str, str] = field(default_factory=dict)
+    """Headers of the response, looked up case-insensitively."""
+    encoding: str | None = None
+    elapsed: float = 0.0
+    """Seconds taken by the transport to return the response."""
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.headers, CaseInsensitiveDict):
+            self.headers = CaseInsensitiveDict(self.headers)
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """True if status_code is less than 400."""
+        return self.status_code < 400
+
+    @property
+    def apparent_encoding(self) -> str | None:
+        """Encoding guessed from the content."""
+        return chardet.detect(self.content)["encoding"] if chardet is not None else None
+
+    @property
+    def text(self) -> str:
+        """Content decoded with encoding, or apparent_encoding if encoding is unknown."""
+        return self.content.decode(self.encoding or self.apparent_encoding or "utf-8", errors="replace")
+
+    def raise_for_status(self) -> None:
+        """Raise requests.HTTPError if the response is an error."""
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)  # type: ignore
+
+
+class Transport(ABC):
+    """Base class for transports."""
+
+    @abstractmethod
+    def send(self, request: Request) -> Response:
+        """Send a request and return its response. HTTP errors are returned, not raised."""
+
+
+class RequestsTransport(Transport):
+    """Transport backed by a requests session."""
+
+    def __init__(self, session: requests.Session | None = None) -> None:
+        self.session = session or requests.Session()
+
+    def send(self, request: Request) -> Response:
+        start = time.perf_counter()
+        # The body is streamed, so that the time until the headers (DNS, connect and wait) is told apart.
+        response = self.session.get(request.url, headers=request.headers, timeout=request.timeout, stream=True)
+        headers_at = time.perf_counter()
+        content = response.content
+        end = time.perf_counter()
+        tracer = tracing.current()
+        if tracer is not None:
+            tracer.add("connect", start, headers_at, url=request.url)
+            tracer.add("download", headers_at, end, url=request.url, bytes=len(content))
+        return Response(
+            url=request.url,
+            status_code=response.status_code,
+            content=content,
+            headers=response.headers,
+            encoding=response.encoding,
+            elapsed=end - start,
+        )
@@ -0,0 +1,81 @@
+"""Circuit breaker middleware"""
+from __future__ import annotations
+
+import threading
+import time
+import urllib.parse
+
+from ..exceptions import CircuitOpenError
+from .base import Request, Response
+from .middleware import Handler, Middleware
+from .retry import RETRY_ERRORS, RETRY_STATUSES
+
+
+class CircuitBreakerMiddleware(Middleware):
+    """Per-host circuit breaker.
+
+    After ``threshold`` consecutive failures (RETRY_ERRORS or ``statuses``) of a host,
+    its circuit opens and requests to the host are shed with CircuitOpenError for ``reset_timeout`` seconds.
+    Then a single probe request is let through: the circuit closes if it succeeds and opens again if it fails.
+
+    Args:
+        threshold (int, optional): Consecutive failures which open the circuit. Defaults to 5.
+        reset_timeout (float, optional): Seconds the circuit stays open. Defaults to 30.
+        statuses (frozenset[int], optional): Status codes counted as failures. Defaults to RETRY_STATUSES.
+    """
+
+    def __init__(
+        self, threshold: int = 5, reset_timeout: float = 30, statuses: frozenset[int] = RETRY_STATUSES
+    ) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.statuses = statuses
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._probing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        host = urllib.parse.urlsplit(request.url).netloc
+        self._before(host)
+        try:
+            response = call_next(request)
+        except RETRY_ERRORS:
+            self._after(host, False)
+            raise
+        except BaseException:
+            with self._lock:
+                self._probing.discard(host)
+            raise
+        self._after(host, response.status_code not in self.statuses)
+        return response
+
+    def state(self, host: str) -> str:
+        """State of the circuit of a host, "closed", "open" or "half-open"."""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return "closed"
+            if host in self._probing or time.monotonic() - opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def _before(self, host: str) -> None:
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if host in self._probing or time.monotonic() - opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"circuit of {host} is open")
+            self._probing.add(host)
+
+    def _after(self, host: str, success: bool) -> None:
+        with self._lock:
+            self._probing.discard(host)
+            if success:
+                self._failures.pop(host, None)
+                self._opened_at.pop(host, None)
+                return
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if host in self._opened_at or self._failures[host] >= self.threshold:
+                self._opened_at[host] = time.monotonic()
@@ -0,0 +1,46 @@
+"""Caching middleware"""
+from __future__ import annotations
+
+from ..util.cache import LRUCache
+from ..util.metrics import DEFAULT_REGISTRY, MetricsRegistry
+from .base import Request, Response
+from .middleware import Handler, Middleware
+
+
+class CacheMiddleware(Middleware):
+    """In-memory LRU cache of successful responses keyed by url.
+
+    Args:
+        max_entries (int, optional): Max number of cached responses. Defaults to 1024.
+        ttl (float | None, optional): Seconds a response stays fresh. Defaults to None, which means forever.
+        max_bytes (int | None, optional): Max total bytes of cached bodies. Defaults to None, which means unbounded.
+        registry (MetricsRegistry | None, optional): Registry counting hits and misses in
+            kabupy_cache_requests_total. Defaults to DEFAULT_REGISTRY.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        self.responses = LRUCache(max_entries, max_bytes, ttl, sizeof=lambda response: len(response.content))
+        self._requests = (registry or DEFAULT_REGISTRY).counter(
+            "kabupy_cache_requests_total", "Requests to the response cache by result.", ("result",)
+        )
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        response = self.responses.get(request.url)
+        if response is not None:
+            self._requests.inc({"result": "hit"})
+            return response
+        self._requests.inc({"result": "miss"})
+        response = call_next(request)
+        if response.status_code == 200:
+            self.responses.put(request.url, response)
+        return response
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self.responses.clear()
@@ -0,0 +1,96 @@
+"""Record/replay transport"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import time
+
+from ..exceptions import KabupyError
+from .base import Request, RequestsTransport, Response, Transport
+
+
+class CassetteTransport(Transport):
+    """Transport which records responses to a cassette directory, or replays them from it.
+
+    In record mode every request is sent through ``transport`` and its response is written to the directory.
+    In replay mode responses are served from the directory only, optionally after an injected delay of
+    ``latency`` seconds plus a uniform random jitter in ``[-jitter, jitter]``, so that concurrent code
+    can be benchmarked realistically without network.
+
+    Args:
+        directory (str | os.PathLike): Cassette directory. It is created if it does not exist.
+        mode (str, optional): "record" or "replay". Defaults to "replay".
+        transport (Transport | None, optional): Transport used in record mode. Defaults to RequestsTransport.
+        latency (float, optional): Injected latency in seconds in replay mode. Defaults to 0.
+        jitter (float, optional): Injected jitter in seconds in replay mode. Defaults to 0.
+        seed (int | None, optional): Seed of the jitter, for reproducible runs. Defaults to None.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        directory: str | os.PathLike,
+        mode: str = "replay",
+        transport: Transport | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay', not {mode!r}")
+        self.directory = os.fspath(directory)
+        self.mode = mode
+        self.transport = transport or RequestsTransport()
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def send(self, request: Request) -> Response:
+        if self.mode == "record":
+            response = self.transport.send(request)
+            self.put(response)
+            return response
+        response = self.get(request.url)
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter) if self.jitter else self.latency
+        if delay > 0:
+            time.sleep(delay)
+            response.elapsed = delay
+        return response
+
+    def put(self, response: Response) -> None:
+        """Write a response to the cassette."""
+        path = self._path(response.url)
+        with open(path + ".body", "wb") as handle:
+            handle.write(response.content)
+        meta = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+        }
+        with open(path + ".json", "w", encoding="utf-8") as handle:
+            json.dump(meta, handle, ensure_ascii=False)
+
+    def get(self, url: str) -> Response:
+        """Read a response of a url from the cassette.
+
+        Raises:
+            KabupyError: If the url is not recorded.
+        """
+        path = self._path(url)
+        try:
+            with open(path + ".json", "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            with open(path + ".body", "rb") as handle:
+                content = handle.read()
+        except FileNotFoundError as ex:
+            raise KabupyError(f"{url} is not recorded in {self.directory}") from ex
+        return Response(content=content, **meta)
+
+    def __contains__(self, url: str) -> bool:
+        return os.path.exists(self._path(url) + ".json")
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest())  # nosec
@@ -0,0 +1,143 @@
+"""Adaptive concurrency middleware"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import Counter
+
+import requests
+
+from ..util import tracing
+from ..util.metrics import DEFAULT_REGISTRY, MetricsRegistry
+from .base import Request, Response
+from .middleware import Handler, Middleware
+
+THROTTLE_STATUSES = frozenset({429, 503})
+"""Status codes which mean the server is throttling us."""
+
+
+class AdaptiveConcurrencyMiddleware(Middleware):  # pylint: disable=too-many-instance-attributes
+    """Limit the number of requests in flight with AIMD (additive increase, multiplicative decrease).
+
+    Every successful request whose latency stays within ``tolerance`` times the lowest latency seen so far
+    grows the limit by ``increase / limit``, i.e. by about ``increase`` per round of requests.
+    A request which timed out or was throttled (429, 503) multiplies the limit by ``decrease``,
+    at most once per observed latency so that a burst of failures from one round is counted once.
+    Other requests hold the limit. Requests over the limit wait until a slot is released.
+
+    Place it after RetryMiddleware, so that every attempt takes a slot and throttling is observed.
+
+    Args:
+        initial (float, optional): Initial limit. Defaults to 4.
+        min_limit (int, optional): Lower bound of the limit. Defaults to 1.
+        max_limit (int, optional): Upper bound of the limit. Defaults to 32.
+        increase (float, optional): Additive increase per round. Defaults to 1.
+        decrease (float, optional): Multiplicative decrease. Defaults to 0.5.
+        tolerance (float, optional): Latency over ``tolerance`` times the lowest latency holds the limit.
+            Defaults to 2.
+        registry (MetricsRegistry | None, optional): Registry recording kabupy_concurrency_limit,
+            kabupy_concurrency_in_flight, kabupy_concurrency_wait_seconds and kabupy_concurrency_decisions_total
+            (by decision). Defaults to DEFAULT_REGISTRY.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        initial: float = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        increase: float = 1,
+        decrease: float = 0.5,
+        tolerance: float = 2,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.inflight = 0
+        self.min_latency: float | None = None
+        self.decisions: Counter[str] = Counter()
+        self._last_decrease = -math.inf
+        self._condition = threading.Condition()
+        registry = registry or DEFAULT_REGISTRY
+        self._limit = registry.gauge("kabupy_concurrency_limit", "Limit of requests in flight.")
+        self._inflight = registry.gauge("kabupy_concurrency_in_flight", "Requests in flight under the limit.")
+        self._waits = registry.histogram("kabupy_concurrency_wait_seconds", "Seconds requests waited for a slot.")
+        self._decisions = registry.counter(
+            "kabupy_concurrency_decisions_total", "Decisions on the limit by outcome of requests.", ("decision",)
+        )
+        self._limit.set(self.limit)
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        self.acquire()
+        start = time.monotonic()
+        try:
+            response = call_next(request)
+        except requests.Timeout:
+            self.release(time.monotonic() - start, throttled=True)
+            raise
+        except BaseException:
+            self.release(None)
+            raise
+        self.release(time.monotonic() - start, throttled=response.status_code in THROTTLE_STATUSES)
+        return response
+
+    def acquire(self) -> float:
+        """Wait for a slot and take it. Return the seconds waited."""
+        start = time.monotonic()
+        with self._condition, tracing.span("concurrency"):
+            while self.inflight >= int(self.limit):
+                self._condition.wait()
+            self.inflight += 1
+            inflight = self.inflight
+        waited = time.monotonic() - start
+        self._inflight.set(inflight)
+        self._waits.observe(waited)
+        return waited
+
+    def release(self, latency: float | None, throttled: bool = False) -> None:
+        """Release a slot and adapt the limit to the outcome of its request.
+
+        Args:
+            latency (float | None): Latency of the request, or None if it failed without telling anything.
+            throttled (bool, optional): True if the request timed out or was throttled. Defaults to False.
+        """
+        with self._condition:
+            self.inflight -= 1
+            now = time.monotonic()
+            if latency is None:
+                decision = "hold"
+            elif throttled:
+                if now - self._last_decrease > (self.min_latency or latency):
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._last_decrease = now
+                    decision = "decrease"
+                else:
+                    decision = "hold"
+            else:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if latency <= self.min_latency * self.tolerance:
+                    self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+                    decision = "increase"
+                else:
+                    decision = "hold"
+            self.decisions[decision] += 1
+            self._condition.notify_all()
+            inflight, limit = self.inflight, self.limit
+        self._inflight.set(inflight)
+        self._limit.set(limit)
+        self._decisions.inc({"decision": decision})
+
+    def snapshot(self) -> dict:
+        """Return the current limit, the requests in flight and the counts of decisions."""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "inflight": self.inflight,
+                "min_latency": self.min_latency,
+                "decisions": dict(self.decisions),
+            }
@@ -0,0 +1,163 @@
+"""Latency-aware timeout and hedging middlewares"""
+from __future__ import annotations
+
+import threading
+import time
+import urllib.parse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from .base import Request, Response
+from .middleware import Handler, Middleware
+
+
+def page_type(url: str) -> str:
+    """Key of the latency statistics of a url, its host and path, e.g. "kabuyoho.jp/sp/reportTop"."""
+    parts = urllib.parse.urlsplit(url)
+    return parts.netloc + parts.path
+
+
+class LatencyTracker:
+    """Sliding window of the latencies of successful requests for each page type.
+
+    Args:
+        window (int, optional): Number of latencies kept for each page type. Defaults to 200.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, url: str, latency: float) -> None:
+        """Add a latency of a url."""
+        key = page_type(url)
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def count(self, url: str) -> int:
+        """Number of latencies kept for the page type of a url."""
+        with self._lock:
+            return len(self._latencies.get(page_type(url), ()))
+
+    def percentile(self, url: str, quantile: float) -> float | None:
+        """Quantile (0 <= quantile <= 1) of the latencies of the page type of a url, None if none is kept."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(page_type(url), ()))
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+
+class AdaptiveTimeoutMiddleware(Middleware):
+    """Set the timeout of a request from the observed latencies of its page type.
+
+    The timeout is ``multiplier`` times the ``percentile`` of the latencies, clamped to
+    ``[min_timeout, max_timeout]``. Until ``min_samples`` latencies are observed, ``max_timeout`` is used.
+
+    Args:
+        percentile (float, optional): Quantile of the latencies. Defaults to 0.99.
+        multiplier (float, optional): Multiplier of the quantile. Defaults to 3.
+        min_timeout (float, optional): Lower bound of the timeout. Defaults to 1.
+        max_timeout (float, optional): Upper bound of the timeout. Defaults to 10.
+        min_samples (int, optional): Latencies needed before adapting. Defaults to 20.
+        tracker (LatencyTracker | None, optional): Tracker of the latencies, which may be shared.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        percentile: float = 0.99,
+        multiplier: float = 3,
+        min_timeout: float = 1,
+        max_timeout: float = 10,
+        min_samples: int = 20,
+        tracker: LatencyTracker | None = None,
+    ) -> None:
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.tracker = tracker or LatencyTracker()
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        request.timeout = self.timeout(request.url)
+        start = time.monotonic()
+        response = call_next(request)
+        if response.ok:
+            self.tracker.observe(request.url, time.monotonic() - start)
+        return response
+
+    def timeout(self, url: str) -> float:
+        """Timeout of a request to a url."""
+        latency = self.tracker.percentile(url, self.percentile)
+        if latency is None or self.tracker.count(url) < self.min_samples:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.multiplier * latency))
+
+
+class HedgingMiddleware(Middleware):
+    """Send a duplicate of a straggling request and keep whichever response arrives first.
+
+    When no response arrived after the ``percentile`` of the latencies of the page type, the request is sent
+    again through the rest of the chain. Place it before the rate limiting and concurrency middlewares, so that
+    hedges are counted against them. The loser is not cancelled, its response is just discarded.
+    An error is only raised once both requests failed, and it is the one of the original request.
+
+    Args:
+        percentile (float, optional): Quantile of the latencies after which a hedge is sent. Defaults to 0.95.
+        min_samples (int, optional): Latencies needed before hedging. Defaults to 20.
+        max_workers (int, optional): Threads sending the requests. Defaults to 16.
+        tracker (LatencyTracker | None, optional): Tracker of the latencies, which may be shared.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        max_workers: int = 16,
+        tracker: LatencyTracker | None = None,
+    ) -> None:
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.tracker = tracker or LatencyTracker()
+        self.hedges = 0
+        """Number of hedges sent."""
+        self.wins = 0
+        """Number of hedges which arrived first."""
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kabupy-hedge")
+        self._lock = threading.Lock()
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        delay = self.tracker.percentile(request.url, self.percentile)
+        if delay is None or self.tracker.count(request.url) < self.min_samples:
+            return self._timed(request, call_next)
+        primary = self._executor.submit(self._timed, request, call_next)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        hedge = self._executor.submit(
+            self._timed, Request(request.url, dict(request.headers), request.timeout), call_next
+        )
+        with self._lock:
+            self.hedges += 1
+        pending: set[Future] = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.wins += 1
+                    return future.result()
+        return primary.result()
+
+    def _timed(self, request: Request, call_next: Handler) -> Response:
+        start = time.monotonic()
+        response = call_next(request)
+        if response.ok:
+            self.tracker.observe(request.url, time.monotonic() - start)
+        return response
@@ -0,0 +1,76 @@
+"""Metrics middleware"""
+from __future__ import annotations
+
+import threading
+import time
+import urllib.parse
+from collections import Counter
+
+from ..util.metrics import BYTES_BUCKETS, DEFAULT_REGISTRY, MetricsRegistry
+from .base import Request, Response
+from .middleware import Handler, Middleware
+
+
+class MetricsMiddleware(Middleware):  # pylint: disable=too-many-instance-attributes
+    """Count requests, status codes, response bytes and transport time.
+
+    They are also recorded in a metrics registry, labelled by host and page type (the path of the url):
+    kabupy_requests_total (with status), kabupy_request_errors_total (with error), kabupy_request_seconds,
+    kabupy_response_bytes and kabupy_requests_in_flight.
+
+    Args:
+        registry (MetricsRegistry | None, optional): Registry to record to. Defaults to DEFAULT_REGISTRY.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.statuses: Counter[int] = Counter()
+        self.bytes = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+        registry = registry or DEFAULT_REGISTRY
+        labels = ("host", "page_type")
+        self._requests = registry.counter("kabupy_requests_total", "Requests by status code.", (*labels, "status"))
+        self._errors = registry.counter("kabupy_request_errors_total", "Requests which raised.", (*labels, "error"))
+        self._seconds = registry.histogram("kabupy_request_seconds", "Latency of requests in seconds.", labels)
+        self._bytes = registry.histogram(
+            "kabupy_response_bytes", "Bytes of response bodies.", labels, buckets=BYTES_BUCKETS
+        )
+        self._inflight = registry.gauge("kabupy_requests_in_flight", "Requests in flight.", ("host",))
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        url = urllib.parse.urlsplit(request.url)
+        labels = {"host": url.netloc, "page_type": url.path}
+        self._inflight.inc({"host": url.netloc})
+        start = time.monotonic()
+        try:
+            response = call_next(request)
+        except Exception as ex:
+            with self._lock:
+                self.requests += 1
+                self.errors += 1
+            self._errors.inc({**labels, "error": type(ex).__name__})
+            raise
+        finally:
+            self._inflight.dec({"host": url.netloc})
+        with self._lock:
+            self.requests += 1
+            self.statuses[response.status_code] += 1
+            self.bytes += len(response.content)
+            self.seconds += response.elapsed
+        self._requests.inc({**labels, "status": str(response.status_code)})
+        self._seconds.observe(time.monotonic() - start, labels)
+        self._bytes.observe(len(response.content), labels)
+        return response
+
+    def snapshot(self) -> dict:
+        """Return the current values."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "statuses": dict(self.statuses),
+                "bytes": self.bytes,
+                "seconds": self.seconds,
+            }
@@ -0,0 +1,41 @@
+"""Middleware chain in front of a transport"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, Sequence
+
+from .base import Request, Response, Transport
+
+Handler = Callable[[Request], Response]
+"""Callable which sends a request through the rest of the chain."""
+
+
+class Middleware(ABC):
+    """Base class for middlewares.
+
+    A middleware receives a request together with the handler of the rest of the chain.
+    It may return a response without calling the handler (e.g. a cache hit), call it several times
+    (e.g. retries), or inspect and modify the request and the response around it.
+    """
+
+    @abstractmethod
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        """Handle a request."""
+
+
+def build_handler(middlewares: Sequence[Middleware], transport: Transport) -> Handler:
+    """Compose middlewares and a transport into a single handler.
+
+    The first middleware is the outermost one, i.e. it sees the request first and the response last.
+    """
+    handler: Handler = transport.send
+    for middleware in reversed(middlewares):
+        handler = _bind(middleware, handler)
+    return handler
+
+
+def _bind(middleware: Middleware, call_next: Handler) -> Handler:
+    def handler(request: Request) -> Response:
+        return middleware.handle(request, call_next)
+
+    return handler
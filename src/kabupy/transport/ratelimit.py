@@ -0,0 +1,47 @@
+"""Rate limiting middleware"""
+from __future__ import annotations
+
+import threading
+import time
+import urllib.parse
+
+from ..constants import TIME_SLEEP
+from ..util import tracing
+from ..util.metrics import DEFAULT_REGISTRY, MetricsRegistry
+from .base import Request, Response
+from .middleware import Handler, Middleware
+
+
+class RateLimitMiddleware(Middleware):
+    """Keep at least ``interval`` seconds between the starts of two requests to the same host.
+
+    Args:
+        interval (float, optional): Min interval in seconds. Defaults to TIME_SLEEP.
+        registry (MetricsRegistry | None, optional): Registry recording the waits in
+            kabupy_rate_limit_wait_seconds by host. Defaults to DEFAULT_REGISTRY.
+    """
+
+    def __init__(self, interval: float = TIME_SLEEP, registry: MetricsRegistry | None = None) -> None:
+        self.interval = interval
+        self._waits = (registry or DEFAULT_REGISTRY).histogram(
+            "kabupy_rate_limit_wait_seconds", "Seconds requests waited for the rate limiter.", ("host",)
+        )
+        self._next: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        self.wait(urllib.parse.urlsplit(request.url).netloc)
+        return call_next(request)
+
+    def wait(self, host: str) -> float:
+        """Reserve the next slot of a host and sleep until it. Return the seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        delay = start - now
+        self._waits.observe(max(delay, 0.0), {"host": host})
+        if delay > 0:
+            with tracing.span("rate_limit", host=host):
+                time.sleep(delay)
+        return delay
@@ -0,0 +1,52 @@
+"""Recording middlewares and archive transport"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from ..archive import PageArchive
+from .base import Request, Response, Transport
+from .cassette import CassetteTransport
+from .middleware import Handler, Middleware
+
+
+class RecordMiddleware(Middleware):
+    """Write every successful response to a cassette, to be replayed later by it."""
+
+    def __init__(self, cassette: CassetteTransport) -> None:
+        self.cassette = cassette
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        response = call_next(request)
+        if response.ok:
+            self.cassette.put(response)
+        return response
+
+
+class ArchiveMiddleware(Middleware):
+    """Append every successful response to a page archive."""
+
+    def __init__(self, archive: PageArchive) -> None:
+        self.archive = archive
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        response = call_next(request)
+        if response.ok:
+            self.archive.append(response.url, response.content, encoding=response.encoding, status=response.status_code)
+        return response
+
+
+class ArchiveTransport(Transport):
+    """Transport which replays pages from a page archive as they were at as_of.
+
+    Args:
+        archive (PageArchive): Archive to replay.
+        as_of (datetime | None, optional): Point in time to replay. Defaults to None, which means the latest.
+    """
+
+    def __init__(self, archive: PageArchive, as_of: datetime | None = None) -> None:
+        self.archive = archive
+        self.as_of = as_of
+
+    def send(self, request: Request) -> Response:
+        content, record = self.archive.get(request.url, self.as_of)
+        return Response(url=request.url, status_code=record.status, content=content, encoding=record.encoding)
@@ -0,0 +1,101 @@
+"""Retry middleware"""
+from __future__ import annotations
+
+import random
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from ..util.metrics import DEFAULT_REGISTRY, MetricsRegistry
+from .base import Request, Response
+from .middleware import Handler, Middleware
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+"""Status codes which are retried by default."""
+
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+"""Errors which are retried: connection errors, timeouts and bodies cut off mid-stream."""
+
+
+class RetryMiddleware(Middleware):
+    """Retry requests which failed with one of RETRY_ERRORS or a retryable status code.
+
+    The n-th retry waits a random time in ``[0, min(max_delay, backoff * 2 ** n)]`` (exponential backoff
+    with full jitter), unless the response has a ``Retry-After`` header, which is then honored.
+    A response whose ``Retry-After`` is longer than ``max_delay`` is returned without retrying.
+
+    Args:
+        retries (int, optional): Max number of retries. Defaults to 3.
+        backoff (float, optional): Base of the backoff in seconds. Defaults to 0.5.
+        max_delay (float, optional): Max seconds to wait before a retry. Defaults to 30.
+        statuses (frozenset[int], optional): Status codes to retry. Defaults to RETRY_STATUSES.
+        seed (int | None, optional): Seed of the jitter. Defaults to None.
+        registry (MetricsRegistry | None, optional): Registry counting retries in kabupy_retries_total
+            by host and reason. Defaults to DEFAULT_REGISTRY.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_delay: float = 30,
+        statuses: frozenset[int] = RETRY_STATUSES,
+        seed: int | None = None,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.statuses = statuses
+        self._random = random.Random(seed)
+        self._retries = (registry or DEFAULT_REGISTRY).counter(
+            "kabupy_retries_total", "Retried requests by reason.", ("host", "reason")
+        )
+
+    def handle(self, request: Request, call_next: Handler) -> Response:
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                response = call_next(request)
+            except RETRY_ERRORS as ex:
+                if last:
+                    raise
+                delay = self.delay(attempt)
+                reason = type(ex).__name__
+            else:
+                if last or response.status_code not in self.statuses:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is None:
+                    delay = self.delay(attempt)
+                elif retry_after > self.max_delay:
+                    return response
+                else:
+                    delay = retry_after
+                reason = str(response.status_code)
+            self._retries.inc({"host": urllib.parse.urlsplit(request.url).netloc, "reason": reason})
+            time.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before the retry following the given attempt (0-origin)."""
+        return self._random.uniform(0, min(self.max_delay, self.backoff * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header, either in seconds or in HTTP-date, into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,114 @@
+"""Bounded LRU cache"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and approximate size, with an optional TTL.
+
+    Args:
+        max_entries (int | None, optional): Max number of entries. Defaults to None, which means unbounded.
+        max_bytes (int | None, optional): Max total size of entries. Defaults to None, which means unbounded.
+        ttl (float | None, optional): Seconds an entry lives. Defaults to None, which means forever.
+        sizeof (Callable[[Any], int] | None, optional): Approximate size of a value in bytes.
+            It is evaluated when a value is put or resized. Defaults to None, which means 0.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        sizeof: Callable[[Any], int] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.nbytes = 0
+        """Total size of the entries."""
+        self._entries: OrderedDict[Hashable, list] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value of a key and mark it as recently used, or default if it is missing or expired."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Set the value of a key, evicting the least recently used entries over the bounds."""
+        with self._lock:
+            self._remove(key)
+            size = self.sizeof(value) if self.sizeof is not None else 0
+            self._entries[key] = [value, time.monotonic(), size]
+            self.nbytes += size
+            self._evict()
+
+    def setdefault(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the value of a key, or put and return a new value made by factory if it is missing."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            value = factory()
+            self.put(key, value)
+            return value
+
+    def resize(self, key: Hashable) -> None:
+        """Re-evaluate the size of a value which has grown or shrunk in place."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            size = self.sizeof(entry[0]) if self.sizeof is not None else 0
+            self.nbytes += size - entry[2]
+            entry[2] = size
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value, or default if it is missing."""
+        with self._lock:
+            entry = self._remove(key)
+            return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _lookup(self, key: Hashable) -> list | None:
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[1] >= self.ttl:
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key: Hashable) -> list | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+        return entry
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
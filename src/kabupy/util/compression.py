@@ -0,0 +1,33 @@
+"""Compression of page bodies"""
+from __future__ import annotations
+
+import zlib
+
+try:
+    import zstandard  # type: ignore[import]
+except ImportError:
+    zstandard = None
+
+CODECS = ("zlib", "zstd") if zstandard is not None else ("zlib",)
+"""Available codecs."""
+
+BEST_CODEC = CODECS[-1]
+"""zstd if the zstandard package is installed, zlib otherwise."""
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """Compress data with a codec of CODECS"""
+    if codec == "zlib":
+        return zlib.compress(data)
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data)
+    raise ValueError(f"codec must be one of {CODECS}, not {codec!r}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """Decompress data compressed with a codec of CODECS"""
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"codec must be one of {CODECS}, not {codec!r}")
@@ -0,0 +1,236 @@
+"""In-process registry of counters, gauges and histograms with Prometheus text export."""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Mapping, NamedTuple, Sequence
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Default buckets of histograms in seconds."""
+
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+"""Buckets of histograms of sizes in bytes."""
+
+
+class Sample(NamedTuple):
+    """A value of a metric, as passed to the listeners of a registry and returned by MetricsRegistry.collect."""
+
+    name: str
+    labels: dict[str, str]
+    value: float
+
+
+class Metric(ABC):
+    """Base class of metrics. Values are kept per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labels: Sequence[str]) -> None:
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, str] | None) -> tuple[str, ...]:
+        labels = labels or {}
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, not {tuple(labels)}")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    @abstractmethod
+    def samples(self) -> list[Sample]:
+        """Current values."""
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labels: Sequence[str]) -> None:
+        super().__init__(registry, name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: Mapping[str, str] | None = None, amount: float = 1) -> None:
+        """Increase the value of the labels by amount, e.g. ``inc({"host": "kabuyoho.jp"})``."""
+        key = self._key(labels)
+        with self._lock:
+            value = self._values[key] = self._values.get(key, 0) + amount
+        self.registry.notify(Sample(self.name, dict(zip(self.labels, key)), value))
+
+    def value(self, labels: Mapping[str, str] | None = None) -> float:
+        """Current value of the labels."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            return [Sample(self.name, dict(zip(self.labels, k)), v) for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value which goes up and down."""
+
+    kind = "gauge"
+
+    def dec(self, labels: Mapping[str, str] | None = None, amount: float = 1) -> None:
+        """Decrease the value of the labels by amount."""
+        self.inc(labels, -amount)
+
+    def set(self, value: float, labels: Mapping[str, str] | None = None) -> None:
+        """Set the value of the labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+        self.registry.notify(Sample(self.name, dict(zip(self.labels, key)), value))
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labels: Sequence[str],
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple[str, ...], list] = {}
+        """Counts per bucket and +Inf, then sum, by label values."""
+
+    def observe(self, value: float, labels: Mapping[str, str] | None = None) -> None:
+        """Add an observation to the labels."""
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+            entry[bisect.bisect_left(self.buckets, value)] += 1
+            entry[-1] += value
+        self.registry.notify(Sample(self.name, dict(zip(self.labels, key)), value))
+
+    def count(self, labels: Mapping[str, str] | None = None) -> int:
+        """Number of observations of the labels."""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return 0 if entry is None else sum(entry[:-1])
+
+    def sum(self, labels: Mapping[str, str] | None = None) -> float:
+        """Sum of the observations of the labels."""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return 0.0 if entry is None else entry[-1]
+
+    def samples(self) -> list[Sample]:
+        samples = []
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        for key, entry in items:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), entry[:-1]):
+                cumulative += count
+                upper = "+Inf" if bound == math.inf else repr(float(bound))
+                samples.append(Sample(f"{self.name}_bucket", {**labels, "le": upper}, cumulative))
+            samples.append(Sample(f"{self.name}_sum", labels, entry[-1]))
+            samples.append(Sample(f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """Registry of metrics.
+
+    Metrics are created on first use and shared by name. The registry is exported in the Prometheus text format
+    by export(), pulled by collect(), or pushed to listeners on every update.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+        self.listeners: list[Callable[[Sample], None]] = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, documentation: str, labels: Sequence[str], **kwargs) -> Metric:
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(self, name, documentation, labels, **kwargs)
+        if type(metric) is not cls:  # pylint: disable=unidiomatic-typecheck
+            raise ValueError(f"{name} is a {metric.kind}, not a {cls.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str = "", labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get(Counter, name, documentation, labels)  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str = "", labels: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get(Gauge, name, documentation, labels)  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str = "",
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get(Histogram, name, documentation, labels, buckets=buckets)  # type: ignore[return-value]
+
+    def subscribe(self, listener: Callable[[Sample], None]) -> None:
+        """Call listener with every update, e.g. to forward it to another exporter.
+
+        For a histogram, the value of the sample is the observation.
+        """
+        self.listeners.append(listener)
+
+    def notify(self, sample: Sample) -> None:
+        """Pass an update to the listeners."""
+        for listener in self.listeners:
+            listener(sample)
+
+    def collect(self) -> list[Sample]:
+        """Current values of all metrics."""
+        with self._lock:
+            metrics = list(self.metrics.values())
+        return [sample for metric in metrics for sample in metric.samples()]
+
+    def export(self) -> str:
+        """Current values of all metrics in the Prometheus text format."""
+        with self._lock:
+            metrics = sorted(self.metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample in metric.samples():
+                labels = ",".join(f'{k}="{_escape(v)}"' for k, v in sample.labels.items())
+                name = f"{sample.name}{{{labels}}}" if labels else sample.name
+                lines.append(f"{name} {_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Drop all metrics."""
+        with self._lock:
+            self.metrics.clear()
+
+
+DEFAULT_REGISTRY = MetricsRegistry()
+"""Registry the middlewares record to unless they are given another one."""
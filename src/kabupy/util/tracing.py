@@ -0,0 +1,102 @@
+"""Tracing of page loads in the Chrome Trace Event format.
+
+While a tracer is active, the bulk paths record a span per phase of every page load: queue (waiting for a worker),
+rate_limit and concurrency (waiting in middlewares), connect (until the response headers, including DNS),
+download (the body), parse and extract. Spans are complete events ("ph": "X") on the thread which ran them,
+so the JSON written by Tracer.dump opens in chrome://tracing or https://ui.perfetto.dev.
+
+Example::
+
+    from kabupy.util import tracing
+
+    with tracing.trace() as tracer:
+        list(kabuyoho.fetch_pages(codes))
+    tracer.dump("crawl.json")
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, Iterator
+
+_tracer: Tracer | None = None
+
+
+class Tracer:
+    """Recorder of spans."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, **args: Any) -> None:
+        """Record a span between two time.perf_counter() values, on the current thread."""
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": "kabupy",
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": max(end - start, 0.0) * 1e6,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+            self._threads.setdefault(thread.ident or 0, thread.name)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Trace in the Chrome Trace Event format, with the names of the threads."""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str | os.PathLike) -> None:
+        """Write the trace to a JSON file."""
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle)
+
+
+def current() -> Tracer | None:
+    """Active tracer, None if tracing is off."""
+    return _tracer
+
+
+@contextlib.contextmanager
+def trace(tracer: Tracer | None = None) -> Iterator[Tracer]:
+    """Activate a tracer, a new one by default, within a with block."""
+    global _tracer  # pylint: disable=global-statement
+    previous = _tracer
+    _tracer = tracer or Tracer()
+    try:
+        yield _tracer
+    finally:
+        _tracer = previous
+
+
+@contextlib.contextmanager
+def _span(tracer: Tracer, name: str, args: dict[str, Any]) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add(name, start, time.perf_counter(), **args)
+
+
+def span(name: str, **args: Any) -> contextlib.AbstractContextManager:
+    """Context manager recording a span if a tracer is active, and doing nothing otherwise."""
+    tracer = _tracer
+    if tracer is None:
+        return contextlib.nullcontext()
+    return _span(tracer, name, args)
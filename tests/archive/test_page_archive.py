@@ -0,0 +1,60 @@
+import os
+from datetime import datetime
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.archive import PageArchive
+from kabupy.exceptions import KabupyError
+from kabupy.transport import ArchiveMiddleware, ArchiveTransport
+
+
+class TestPageArchive:
+    def test_append_and_get(self, tmp_path):
+        path = tmp_path / "pages.arc"
+        with PageArchive(path) as archive:
+            archive.append("https://example.com/a", b"first", fetched_at=datetime(2023, 9, 1))
+            archive.append("https://example.com/a", b"second", fetched_at=datetime(2023, 9, 3))
+            archive.append("https://example.com/b", "ページ".encode("utf-8"), encoding="utf-8")
+            assert len(archive) == 3
+            assert archive.get("https://example.com/a")[0] == b"second"
+            assert archive.get("https://example.com/a", datetime(2023, 9, 2))[0] == b"first"
+            assert archive.get("https://example.com/b")[0].decode("utf-8") == "ページ"
+            with pytest.raises(KabupyError):
+                archive.get("https://example.com/a", datetime(2023, 8, 31))
+            with pytest.raises(KabupyError):
+                archive.get("https://example.com/c")
+
+    def test_reopen(self, tmp_path):
+        path = tmp_path / "pages.arc"
+        with PageArchive(path) as archive:
+            archive.append("https://example.com/a", b"first", fetched_at=datetime(2023, 9, 3))
+        with PageArchive(path) as archive:
+            archive.append("https://example.com/a", b"older", fetched_at=datetime(2023, 9, 1))
+            assert [r.fetched_at for r in archive.records("https://example.com/a")] == [
+                datetime(2023, 9, 1),
+                datetime(2023, 9, 3),
+            ]
+            assert archive.get("https://example.com/a")[0] == b"first"
+
+    def test_webpage_sink_and_replay(self, helpers, tmp_path):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "../kabuyoho/html/reportDps/6758.html",
+            )
+        )
+        archive = PageArchive(tmp_path / "pages.arc")
+        website = kabupy.Kabuyoho(middlewares=[ArchiveMiddleware(archive)])
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=6758", text=text)
+            expected = website.stock(6758).report_dps.dividend_payout_ratio
+        assert len(archive) == 1
+        website = kabupy.Kabuyoho(transport=ArchiveTransport(archive, as_of=datetime.now()))
+        with requests_mock.Mocker() as m:
+            page = website.stock(6758).report_dps
+            assert m.call_count == 0
+        assert page.dividend_payout_ratio == expected
+        assert page.html == text
+        archive.close()
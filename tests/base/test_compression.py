@@ -0,0 +1,66 @@
+import gc
+import importlib
+import os
+import sys
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.base import memory_usage
+from kabupy.util import compression
+from kabupy.util.compression import CODECS, compress, decompress
+
+
+class TestCompression:
+    @pytest.mark.parametrize("codec", CODECS)
+    def test_codec(self, codec):
+        data = "株価".encode("utf-8") * 100
+        compressed = compress(data, codec)
+        assert len(compressed) < len(data)
+        assert decompress(compressed, codec) == data
+
+    def test_invalid_codec(self):
+        with pytest.raises(ValueError):
+            compress(b"", "foo")
+        with pytest.raises(ValueError):
+            decompress(b"", "foo")
+
+    def test_without_zstandard(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "zstandard", None)
+        try:
+            module = importlib.reload(compression)
+            assert module.CODECS == ("zlib",)
+            assert module.BEST_CODEC == "zlib"
+            with pytest.raises(ValueError):
+                module.compress(b"", "zstd")
+            with pytest.raises(ValueError):
+                module.decompress(b"", "zstd")
+        finally:
+            monkeypatch.undo()
+            importlib.reload(compression)
+
+    def test_compressed_page(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "../kabuyoho/html/reportTop/6758.html",
+            )
+        )
+        website = kabupy.Kabuyoho(release_soup=True, compression="zlib")
+        gc.collect()
+        before = memory_usage()
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportTop?bcode=6758", text=text)
+            page = website.stock(6758).report_top
+        usage = memory_usage()
+        assert usage["pages"] == before["pages"] + 1
+        assert 0 < usage["content"] - before["content"] < len(text.encode("utf-8")) / 3
+        assert usage["soup"] == before["soup"]
+        assert page.nbytes == usage["total"] - before["total"]
+        assert page.html == text
+        assert page.select_one("main")
+        assert memory_usage()["soup"] > before["soup"]
+        del page
+        gc.collect()
+        assert memory_usage()["pages"] == before["pages"]
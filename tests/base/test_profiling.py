@@ -0,0 +1,58 @@
+import io
+import os
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.base import Webpage, profiling, webpage_property
+from kabupy.errors import ElementNotFoundError
+
+
+@pytest.fixture
+def page(helpers):
+    text = helpers.html2text(
+        filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), "../kabuyoho/html/reportTop/6758.html")
+    )
+    with requests_mock.Mocker() as m:
+        m.get("https://kabuyoho.jp/sp/reportTop?bcode=6758", text=text)
+        yield kabupy.Kabuyoho().stock(6758).report_top
+    profiling.disable()
+    profiling.reset()
+
+
+class TestProfiling:
+    def test_disabled(self, page):
+        select_one = Webpage.select_one
+        get = webpage_property.__get__
+        with profiling.profile():
+            assert Webpage.select_one is not select_one
+        assert Webpage.select_one is select_one
+        assert webpage_property.__get__ is get
+        page.price
+        assert profiling.stats() == []
+
+    def test_stats(self, page):
+        profiling.enable()
+        page.price
+        page.price
+        page.select("main")
+        with pytest.raises(ElementNotFoundError):
+            page.select_one("main div.no-such-class")
+        profiling.disable()
+        entries = {(e.cls, e.property, e.selector): e for e in profiling.stats()}
+        price = entries[("ReportTop", "price", None)]
+        assert (price.calls, price.failures) == (1, 0)
+        selectors = [e for e in entries.values() if e.property == "price" and e.selector is not None]
+        assert len(selectors) == 1
+        assert selectors[0].seconds <= price.seconds
+        assert entries[("ReportTop", None, "main")].calls == 1
+        assert entries[("ReportTop", None, "main div.no-such-class")].failures == 1
+        costs = [e.seconds for e in profiling.stats()]
+        assert costs == sorted(costs, reverse=True)
+        output = io.StringIO()
+        profiling.dump(output, limit=2)
+        assert len(output.getvalue().splitlines()) == 3
+        output = io.StringIO()
+        profiling.dump(output)
+        assert "ReportTop.price" in output.getvalue()
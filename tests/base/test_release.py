@@ -0,0 +1,38 @@
+import os
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.errors import ElementNotFoundError
+from kabupy.kabuyoho.report_top import ReportTop
+
+
+class TestRelease:
+    def test_release(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "../kabuyoho/html/reportTop/6758.html",
+            )
+        )
+        website = kabupy.Kabuyoho(release_soup=True)
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportTop?bcode=6758", text=text)
+            m.get("https://kabuyoho.jp/sp/reportTop?bcode=7837", text="<html></html>")
+            stock = website.stock(6758)
+            expected = {name: getattr(stock.report_top, name) for name in ReportTop.webpage_properties()}
+            empty = website.stock(7837).report_top
+        page = stock.report_top
+        assert page.nbytes == 0
+        assert {name: getattr(page, name) for name in ReportTop.webpage_properties()} == expected
+        with pytest.raises(AttributeError):
+            page.select_one("main")
+        with pytest.raises(ElementNotFoundError):
+            empty.price
+
+    def test_webpage_properties(self):
+        names = ReportTop.webpage_properties()
+        assert "price" in names
+        assert "expected_per" in names
+        assert "html" not in names
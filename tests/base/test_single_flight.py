@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+
+import pytest
+
+import kabupy
+from kabupy.base import SingleFlight
+from kabupy.transport import Response, Transport
+
+
+class SlowTransport(Transport):
+    def __init__(self, content):
+        self.content = content
+        self.count = 0
+
+    def send(self, request):
+        self.count += 1
+        time.sleep(0.1)
+        return Response(url=request.url, status_code=200, content=self.content, encoding="utf-8")
+
+
+def run_in_threads(func, n=8):
+    results: list = [None] * n
+    errors: list = [None] * n
+
+    def target(i):
+        try:
+            results[i] = func(i)
+        except Exception as ex:
+            errors[i] = ex
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestSingleFlight:
+    def test_coalesce(self):
+        group = SingleFlight()
+        calls = []
+
+        def func():
+            calls.append(1)
+            time.sleep(0.1)
+            return len(calls)
+
+        results, _ = run_in_threads(lambda i: group.call("key", func))
+        assert calls == [1]
+        assert results == [1] * 8
+        assert len(group) == 0
+        assert group.call("key", func) == 2
+
+    def test_error(self):
+        group = SingleFlight()
+
+        def func():
+            time.sleep(0.1)
+            raise ValueError("foo")
+
+        _, errors = run_in_threads(lambda i: group.call("key", func))
+        assert all(isinstance(e, ValueError) for e in errors)
+        with pytest.raises(ValueError):
+            group.call("key", func)
+
+    def test_stock_pages(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "../kabuyoho/html/reportDps/6758.html",
+            )
+        )
+        transport = SlowTransport(text.encode("utf-8"))
+        website = kabupy.Kabuyoho(transport=transport)
+        stock = website.stock(6758)
+        stocks = [stock, stock, website.stock(6758), website.stock(6758)]
+        results, _ = run_in_threads(lambda i: stocks[i % 4].report_dps)
+        assert transport.count == 1
+        assert len({id(page.soup) for page in results}) == 1
+        assert results[0].dividend_payout_ratio == 9.9
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import time
+
 import pytest
 
+from kabupy.transport import Response, Transport
+
 
 class Helpers:
     @staticmethod
@@ -15,6 +19,35 @@ class Helpers:
             return f.read()
 
 
+class FakeTransport(Transport):
+    """Transport answering with the given statuses in turn, then repeating the last one.
+
+    An exception in place of a status is raised instead.
+    """
+
+    def __init__(self, statuses=(200,), headers=None, content=b"foo", delay=0.0):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.content = content
+        self.delay = delay
+        self.requests = []
+
+    def send(self, request):
+        self.requests.append(request)
+        time.sleep(self.delay)
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if isinstance(status, BaseException):
+            raise status
+        return Response(
+            url=request.url, status_code=status, content=self.content, headers=dict(self.headers), elapsed=0.01
+        )
+
+
 @pytest.fixture
 def helpers():
     return Helpers
+
+
+@pytest.fixture
+def fake_transport():
+    return FakeTransport
@@ -20,6 +20,20 @@ class TestIssues:
                 == "https://www.jpx.co.jp/markets/statistics-equities/misc/tvdivq0000001vg2-att/data_j.xls"
             )
 
+    def test_issues_link_from_url(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "html/issues.html",
+            )
+        )
+        with requests_mock.Mocker() as m:
+            m.get("http://127.0.0.1:8000/markets/statistics-equities/misc/01.html", text=text)
+            assert (
+                kabupy.Jpx(url="http://127.0.0.1:8000").issues_link
+                == "http://127.0.0.1:8000/markets/statistics-equities/misc/tvdivq0000001vg2-att/data_j.xls"
+            )
+
     def test_actual_dividend_yield(self, helpers):
         bytes = helpers.excel2bytes(
             filename=os.path.join(
@@ -0,0 +1,42 @@
+import os
+
+import requests_mock
+
+import kabupy
+from kabupy.transport import AdaptiveConcurrencyMiddleware
+
+
+class TestFetchPages:
+    def test_fetch_pages(self, helpers):
+        limiter = AdaptiveConcurrencyMiddleware()
+        website = kabupy.Kabuyoho(middlewares=[limiter])
+        with requests_mock.Mocker() as m:
+            for security_code in [6758, 7837]:
+                for page in ["reportTop", "reportDps"]:
+                    text = helpers.html2text(
+                        filename=os.path.join(
+                            os.path.dirname(os.path.realpath(__file__)),
+                            f"html/{page}/{security_code}.html",
+                        )
+                    )
+                    m.get(f"https://kabuyoho.jp/sp/{page}?bcode={security_code}", text=text)
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=9999", status_code=404)
+            results = list(website.fetch_pages([6758, 7837, 9999], pages=["report_top", "report_dps"]))
+        assert len(results) == 6
+        errors = [r for r in results if r.error is not None]
+        assert {(r.stock.security_code, r.page) for r in errors} == {("9999", "report_top"), ("9999", "report_dps")}
+        loaded = {(r.stock.security_code, r.page): r.stock for r in results if r.error is None}
+        assert loaded[("6758", "report_dps")].report_dps.dividend_payout_ratio == 9.9
+        assert limiter.inflight == 0
+        assert sum(limiter.decisions.values()) == 6
+
+    def test_fetch_pages_from_url(self, helpers):
+        website = kabupy.Kabuyoho(middlewares=[], url="http://127.0.0.1:8000")
+        text = helpers.html2text(
+            filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), "html/reportDps/6758.html")
+        )
+        with requests_mock.Mocker() as m:
+            m.get("http://127.0.0.1:8000/sp/reportDps?bcode=6758", text=text)
+            results = list(website.fetch_pages([6758], pages=["report_dps"]))
+        assert results[0].error is None
+        assert results[0].stock.report_dps.dividend_payout_ratio == 9.9
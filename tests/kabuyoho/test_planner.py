@@ -0,0 +1,76 @@
+import os
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.kabuyoho import FetchPlanner
+from kabupy.kabuyoho.kabuyoho import PAGE_CLASSES
+from kabupy.transport import CacheMiddleware, RequestsTransport
+
+PATHS = ["reportDps", "reportTrendSignal", "reportTop", "reportTarget"]
+CODES = ["6758", "7837"]
+
+
+@pytest.fixture
+def mocker(helpers):
+    with requests_mock.Mocker() as m:
+        for path in PATHS:
+            for code in CODES:
+                text = helpers.html2text(
+                    filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), f"html/{path}/{code}.html")
+                )
+                m.get(f"https://kabuyoho.jp/sp/{path}?bcode={code}", text=text)
+        yield m
+
+
+class TestFetchPlanner:
+    def test_page_classes(self, mocker):
+        stock = kabupy.kabuyoho.stock(6758)
+        for name, cls in PAGE_CLASSES.items():
+            page = getattr(stock, name)
+            assert type(page) is cls
+            assert page.url == cls.page_url(kabupy.kabuyoho.url, 6758)
+
+    def test_cover(self):
+        planner = FetchPlanner(kabupy.kabuyoho)
+        assert planner.cover(["price", "expected_dividend_yield"]) == {
+            "price": "report_dps",
+            "expected_dividend_yield": "report_dps",
+        }
+        assert set(planner.cover(["price", "expected_dividend_yield"], ["report_top"]).values()) == {"report_top"}
+        assert set(planner.cover(["target_price", "trend_signal", "name"]).values()) == {
+            "report_top",
+            "report_trend_signal",
+        }
+        with pytest.raises(ValueError):
+            planner.cover(["foo"])
+
+    def test_query(self, mocker):
+        planner = FetchPlanner(kabupy.Kabuyoho())
+        values = planner.query(["price", "expected_dividend_yield", "price_level_to_target"], CODES)
+        assert mocker.call_count == 2
+        assert all("reportTop" in r.url for r in mocker.request_history)
+        assert set(values) == set(CODES)
+        assert all(set(v) == {"price", "expected_dividend_yield", "price_level_to_target"} for v in values.values())
+        assert values["6758"]["price"] == kabupy.kabuyoho.stock(6758).report_top.price
+
+    def test_prefer_loaded_page(self, mocker):
+        kabuyoho = kabupy.Kabuyoho(stocks=kabupy.util.cache.LRUCache(16))
+        kabuyoho.stock(6758).report_target
+        planner = FetchPlanner(kabuyoho)
+        plan = planner.plan(["name", "price"], CODES)
+        assert plan.fetches == [("7837", "report_dps")]
+        assert plan.sources["6758"] == {"name": "report_target", "price": "report_target"}
+        values = planner.query(["name", "price"], CODES)
+        assert mocker.call_count == 2
+        assert values["6758"]["name"] == "ソニーグループ"
+
+    def test_prefer_cached_response(self, mocker):
+        cache = CacheMiddleware()
+        kabuyoho = kabupy.Kabuyoho(RequestsTransport(), [cache])
+        kabuyoho.stock(6758).report_trend_signal
+        plan = FetchPlanner(kabuyoho).plan(["price"], [6758])
+        assert plan.fetches == [("6758", "report_trend_signal")]
+        FetchPlanner(kabuyoho).query(["price"], [6758])
+        assert mocker.call_count == 1
@@ -0,0 +1,67 @@
+import os
+from datetime import datetime
+
+import requests_mock
+from money import Money
+
+import kabupy
+from kabupy.kabuyoho import Dividend, NewsItem, records_to_frame
+
+
+class TestRecords:
+    def test_dividend_history_records(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "html/reportDps/6758.html",
+            )
+        )
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=6758", text=text)
+            page = kabupy.kabuyoho.stock(6758).report_dps
+        records = page.dividend_history_records
+        assert records[0] == Dividend(datetime(2021, 3, 1), Money("55.0", "JPY"))
+        assert [r._asdict() for r in records] == page.dividend_history
+        assert "dividend_history_records" not in page.webpage_properties()
+        assert "dividend_history_records" not in page.extract()
+        frame = records_to_frame(records, Dividend)
+        assert list(frame.columns) == ["date", "dividend"]
+        assert frame["dividend"].dtype == "float64"
+        assert frame["dividend"].tolist()[:3] == [55.0, 65.0, 75.0]
+        assert frame["dividend"].isna().tolist() == [False, False, False, True]
+
+    def test_dividend_history_parsed_once(self, helpers, monkeypatch):
+        text = helpers.html2text(
+            filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), "html/reportDps/6758.html")
+        )
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=6758", text=text)
+            page = kabupy.Kabuyoho(release_soup=True).stock(6758).report_dps
+        selectors = []
+        monkeypatch.setattr(page, "select", lambda selector: selectors.append(selector))
+        records = page.dividend_history_records
+        assert [r._asdict() for r in records] == page.dividend_history
+        assert page.dividend_history_records == records
+        assert not selectors
+
+    def test_news_records(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "html/reportNews/market_report/6758.html",
+            )
+        )
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportNews?bcode=6758&cat=1", text=text)
+            page = kabupy.kabuyoho.stock(6758).report_news.market_report
+            records = page.get_link_records()
+            links = page.get_links()
+        assert all(isinstance(r, NewsItem) for r in records)
+        assert [r._asdict() for r in records] == links
+        frame = records_to_frame(records, NewsItem)
+        assert list(frame.columns) == ["date", "title", "category", "weather", "url"]
+        assert len(frame) == len(links)
+        assert frame["date"].iloc[0] == links[0]["date"]
+
+    def test_empty_frame(self):
+        assert list(records_to_frame([], NewsItem).columns) == list(NewsItem._fields)
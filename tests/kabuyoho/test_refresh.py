@@ -0,0 +1,89 @@
+import os
+import time
+
+import kabupy
+from kabupy.transport import Response, Transport
+
+html_directory = os.path.join(os.path.dirname(os.path.realpath(__file__)), "html")
+
+
+class VersionedTransport(Transport):
+    """Serve a fixture per url, answering 304 to a request with the current ETag."""
+
+    def __init__(self, files):
+        self.files = files
+        self.version = 0
+        self.requests = []
+
+    def send(self, request):
+        self.requests.append(request)
+        etag = f'"{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return Response(url=request.url, status_code=304, content=b"")
+        path = os.path.join(html_directory, self.files[request.url][self.version])
+        with open(path, "rb") as f:
+            content = f.read()
+        return Response(url=request.url, status_code=200, content=content, headers={"etag": etag}, encoding="utf-8")
+
+
+class TestRefresh:
+    url = "https://kabuyoho.jp/sp/reportDps?bcode=6758"
+
+    def test_memoized(self):
+        transport = VersionedTransport({self.url: ["reportDps/6758.html"]})
+        page = kabupy.Kabuyoho(transport=transport).stock(6758).report_dps
+        history = page.dividend_history
+        assert page.dividend_history is history
+        assert page.values["dividend_history"] is history
+
+    def test_refresh(self):
+        transport = VersionedTransport({self.url: ["reportDps/6758.html", "reportDps/7837.html"]})
+        stock = kabupy.Kabuyoho(transport=transport).stock(6758)
+        assert stock.refresh() == []
+        page = stock.report_dps
+        soup = page.soup
+        history = page.dividend_history
+        assert stock.refresh(["report_dps", "report_top"]) == []
+        assert transport.requests[-1].headers == {"If-None-Match": '"0"'}
+        assert page.soup is soup
+        assert page.dividend_history is history
+        transport.version = 1
+        assert stock.refresh() == ["report_dps"]
+        assert stock.report_dps is page
+        assert page.soup is not soup
+        assert page.dividend_payout_ratio == 0.0
+
+    def test_max_age(self):
+        transport = VersionedTransport({self.url: ["reportDps/6758.html", "reportDps/7837.html"]})
+        website = kabupy.Kabuyoho(transport=transport, max_age={"report_dps": 0.05})
+        stock = website.stock(6758)
+        assert stock.report_dps.dividend_payout_ratio == 9.9
+        transport.version = 1
+        assert stock.report_dps.dividend_payout_ratio == 9.9
+        assert len(transport.requests) == 1
+        time.sleep(0.05)
+        assert stock.report_dps.dividend_payout_ratio == 0.0
+        assert len(transport.requests) == 2
+
+    def test_refresh_release(self):
+        transport = VersionedTransport({self.url: ["reportDps/6758.html", "reportDps/7837.html"]})
+        website = kabupy.Kabuyoho(transport=transport, release_soup=True)
+        stock = website.stock(6758)
+        page = stock.report_dps
+        assert page.nbytes == 0
+        transport.version = 1
+        assert stock.refresh(name for name in ["report_dps"]) == ["report_dps"]
+        assert page.nbytes == 0
+        assert page.dividend_payout_ratio == 0.0
+
+    def test_max_age_release(self):
+        transport = VersionedTransport({self.url: ["reportDps/6758.html", "reportDps/7837.html"]})
+        website = kabupy.Kabuyoho(transport=transport, max_age={"report_dps": 0.05}, release_soup=True)
+        stock = website.stock(6758)
+        assert stock.report_dps.dividend_payout_ratio == 9.9
+        assert stock.report_dps.nbytes == 0
+        transport.version = 1
+        time.sleep(0.05)
+        assert stock.report_dps.dividend_payout_ratio == 0.0
+        assert stock.report_dps.nbytes == 0
+        assert len(transport.requests) == 2
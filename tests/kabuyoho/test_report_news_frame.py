@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+import requests_mock
+
+import kabupy
+from kabupy.kabuyoho.report_news import REPORTS, news_frame
+
+CATEGORIES = {"market_report": 1, "flash_report": 2, "analyst_prediction": 3, "analyst_evaluation": 4}
+
+
+def mock_news(m, helpers, code):
+    for report, cat in CATEGORIES.items():
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                f"html/reportNews/{report}/{code}.html",
+            )
+        )
+        m.get(f"https://kabuyoho.jp/sp/reportNews?bcode={code}&cat={cat}", text=text)
+
+
+class TestReportNewsFrame:
+    def test_page_frame_matches_links(self, helpers):
+        with requests_mock.Mocker() as m:
+            mock_news(m, helpers, 6758)
+            for report in REPORTS:
+                page = getattr(kabupy.kabuyoho.stock(6758).report_news, report)
+                frame = page.get_links_frame()
+                links = page.get_links()
+                assert len(frame) == len(links)
+                assert frame["date"].dtype == "datetime64[ns]"
+                assert frame["category"].dtype == "category"
+                assert frame["weather"].dtype == "category"
+                records = [{k: (None if pd.isna(v) else v) for k, v in row.items()} for row in frame.to_dict("records")]
+                assert records == links
+
+    def test_combined_frame(self, helpers):
+        with requests_mock.Mocker() as m:
+            mock_news(m, helpers, 7837)
+            news = kabupy.kabuyoho.stock(7837).report_news
+            frame = news.get_links_frame()
+            expected = sum(len(getattr(news, report).get_links()) for report in REPORTS)
+        assert len(frame) == expected
+        assert list(frame.columns) == ["report", "date", "title", "category", "weather", "url"]
+        assert list(frame["report"].cat.categories) == list(REPORTS)
+
+    def test_news_frame_weather(self):
+        frame = news_frame(
+            {
+                "date": ["2023年09月01日 18:00 ", "2023年09月02日 09:30"],
+                "title": ["a", "b"],
+                "category": ["決算", "決算"],
+                "weather": ["wthr wthr wthr_fine", "wthr"],
+                "url": ["https://kabuyoho.jp/a", "https://kabuyoho.jp/b"],
+            }
+        )
+        assert frame["date"].tolist() == [pd.Timestamp(2023, 9, 1, 18), pd.Timestamp(2023, 9, 2, 9, 30)]
+        assert frame["weather"].iloc[0] == "wthr_fine"
+        assert pd.isna(frame["weather"].iloc[1])
+        assert len(news_frame({field: [] for field in frame.columns})) == 0
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.kabuyoho import Predicate, screen, snapshot_frame
+from kabupy.kabuyoho.screening import derive_metrics, mask
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {
+            "report_top.expected_per": [10.0, 20.0, 12.0, np.nan],
+            "report_top.actual_roe": [12.0, 15.0, 11.0, 20.0],
+            "report_target.price": [100.0, 100.0, 200.0, 100.0],
+            "report_target.price_target": [130.0, 150.0, 300.0, 200.0],
+            "report_target.analyst_count": [3.0, 5.0, 4.0, 1.0],
+            "report_target.per_based_fair_value": [150.0, 90.0, 220.0, np.nan],
+            "report_target.pbr_based_fair_value": [110.0, np.nan, 260.0, np.nan],
+            "report_target.analyst_rating_composition.1": [0.0, 0.0, 0.0, 0.0],
+            "report_target.analyst_rating_composition.2": [0.0, 1.0, 0.0, 0.0],
+            "report_target.analyst_rating_composition.3": [1.0, 2.0, 0.0, 1.0],
+            "report_target.analyst_rating_composition.4": [1.0, 1.0, 2.0, 0.0],
+            "report_target.analyst_rating_composition.5": [1.0, 1.0, 2.0, 0.0],
+        },
+        index=pd.Index(["1111", "2222", "3333", "4444"], name="security_code"),
+    )
+
+
+class TestScreening:
+    def test_derive_metrics(self, frame):
+        metrics = derive_metrics(frame)
+        assert np.allclose(metrics["upside"], [0.3, 0.5, 0.5, 1.0])
+        assert np.allclose(metrics["fair_value_gap"], [0.3, -0.1, 0.2, np.nan], equal_nan=True)
+        assert np.allclose(metrics["rating_mean"], [4.0, 3.4, 4.5, 3.0])
+        assert np.allclose(metrics["rating_bullish_share"], [2 / 3, 0.4, 1.0, 0.0])
+        assert "upside" not in frame.columns
+
+    def test_mask(self, frame):
+        predicates = ["expected_per < 15", Predicate("report_top.actual_roe", ">", 10)]
+        assert mask(frame, predicates).tolist() == [True, False, True, False]
+        assert mask(frame, ["expected_per != 10"]).tolist() == [False, True, True, False]
+        with pytest.raises(ValueError):
+            mask(frame, ["expected_per ~ 10"])
+        with pytest.raises(KeyError):
+            mask(frame, ["foo < 1"])
+
+    def test_screen(self, frame):
+        predicates = ["expected_per < 15", "actual_roe > 10", "upside > 0.2", "analyst_count >= 3"]
+        assert screen(frame, predicates).index.tolist() == ["1111", "3333"]
+        assert screen(frame).index.tolist() == ["1111", "3333", "2222", "4444"]
+        assert screen(frame, k=2).index.tolist() == ["1111", "3333"]
+        assert screen(frame, rank_by="upside", k=1, ascending=True).index.tolist() == ["1111"]
+
+    def test_screen_many(self):
+        rng = np.random.default_rng(0)
+        n = 5000
+        frame = pd.DataFrame(
+            {
+                "report_top.expected_per": rng.uniform(5, 30, n),
+                "report_target.price": rng.uniform(100, 1000, n),
+                "report_target.per_based_fair_value": rng.uniform(100, 1000, n),
+            },
+            index=[str(i) for i in range(n)],
+        )
+        result = screen(frame, ["expected_per < 15"], k=10)
+        gaps = derive_metrics(frame)["fair_value_gap"]
+        expected = gaps.loc[frame["report_top.expected_per"] < 15].sort_values(ascending=False)
+        assert result.index.tolist() == expected.index[:10].tolist()
+
+    def test_snapshot_frame(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), "html/reportTarget/6758.html")
+        )
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportTarget?bcode=6758", text=text)
+            stock = kabupy.Kabuyoho().stock(6758)
+            stock.report_target
+        frame = snapshot_frame([stock])
+        assert frame.index.tolist() == ["6758"]
+        assert frame.loc["6758", "report_target.price"] == float(stock.report_target.price.amount)
+        assert frame.loc["6758", "report_target.analyst_rating_composition.5"] == (
+            stock.report_target.analyst_rating_composition["5"]
+        )
+        assert len(screen(frame)) == 1
@@ -0,0 +1,46 @@
+import os
+from datetime import datetime
+
+import pytest
+import requests_mock
+from money import Money
+
+import kabupy
+
+PAGES = {
+    "report_dps": "reportDps",
+    "report_trend_signal": "reportTrendSignal",
+    "report_top": "reportTop",
+    "report_target": "reportTarget",
+}
+
+
+@pytest.fixture
+def mocker(helpers):
+    with requests_mock.Mocker() as m:
+        for path in PAGES.values():
+            text = helpers.html2text(
+                filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), f"html/{path}/6758.html")
+            )
+            m.get(f"https://kabuyoho.jp/sp/{path}?bcode=6758", text=text)
+        yield m
+
+
+class TestStockHeader:
+    def test_cheapest_page(self, mocker):
+        stock = kabupy.kabuyoho.stock(6758)
+        assert stock.name == "ソニーグループ"
+        assert isinstance(stock.price, Money)
+        assert isinstance(stock.earnings_release_date, datetime)
+        assert mocker.call_count == 1
+        assert "reportDps" in mocker.last_request.url
+        assert stock.header_page is stock.report_dps
+
+    @pytest.mark.parametrize("page", list(PAGES))
+    def test_loaded_page(self, mocker, page):
+        stock = kabupy.kabuyoho.stock(6758)
+        getattr(stock, page)
+        assert stock.header_page is getattr(stock, page)
+        assert stock.name == "ソニーグループ"
+        assert stock.price == getattr(stock, page).price
+        assert mocker.call_count == 1
@@ -0,0 +1,40 @@
+import os
+
+import requests_mock
+
+import kabupy
+from kabupy.util.cache import LRUCache
+
+
+class TestStockRegistry:
+    def test_without_registry(self):
+        website = kabupy.Kabuyoho()
+        assert website.stock(6758) is not website.stock(6758)
+
+    def test_interned(self, helpers):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "html/reportDps/6758.html",
+            )
+        )
+        website = kabupy.Kabuyoho(stocks=LRUCache(max_entries=1))
+        assert website.stock(6758) is website.stock("6758")
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=6758", text=text)
+            assert website.stock(6758).report_dps.dividend_payout_ratio == 9.9
+            assert website.stock(6758).report_dps.dividend_payout_ratio == 9.9
+            assert m.call_count == 1
+        assert website.stocks.nbytes == website.stock(6758).nbytes > len(text)
+        stock = website.stock(6758)
+        website.stock(7837)
+        assert website.stock(6758) is not stock
+
+    def test_max_bytes(self, helpers):
+        website = kabupy.Kabuyoho(stocks=LRUCache(max_bytes=1))
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=6758", text="<html></html>")
+            stock = website.stock(6758)
+            assert stock.report_dps
+        assert len(website.stocks) == 0
+        assert website.stock(6758) is not stock
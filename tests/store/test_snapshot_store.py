@@ -0,0 +1,55 @@
+import math
+import os
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.store import Change, SnapshotStore, diff_snapshots
+
+
+@pytest.fixture
+def texts(helpers):
+    return {
+        path: helpers.html2text(
+            filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), f"../kabuyoho/html/{path}/6758.html")
+        )
+        for path in ["reportTop", "reportTarget"]
+    }
+
+
+class TestSnapshotStore:
+    def test_diff_snapshots(self):
+        old = {"a": 1, "b": math.nan, "c": "x"}
+        new = {"a": 2, "b": math.nan, "d": None, "e": 3}
+        assert diff_snapshots("1", old, new) == [Change("1", "a", 1, 2), Change("1", "e", None, 3)]
+
+    def test_update(self, tmp_path):
+        with SnapshotStore(tmp_path / "snapshots.sqlite") as store:
+            assert store.update("1", {"a": 1}) == [Change("1", "a", None, 1)]
+            assert store.update("1", {"b": 2}) == [Change("1", "b", None, 2)]
+            assert store.update("1", {"a": 1, "b": 3}) == [Change("1", "b", 2, 3)]
+            assert store.get("1") == {"a": 1, "b": 3}
+            assert store.get("2") is None
+            assert len(store) == 1
+
+    def test_fetch_changes(self, tmp_path, texts):
+        pages = ["report_top", "report_target"]
+        with SnapshotStore(tmp_path / "snapshots.sqlite") as store, requests_mock.Mocker() as m:
+            for path, text in texts.items():
+                m.get(f"https://kabuyoho.jp/sp/{path}?bcode=6758", text=text)
+            changes = list(kabupy.Kabuyoho().fetch_changes([6758], store, pages))
+            snapshot = store.get("6758")
+            assert snapshot is not None
+            assert {c.field for c in changes} == {k for k, v in snapshot.items() if v is not None}
+            assert "report_top.signal" in snapshot
+            assert list(kabupy.Kabuyoho().fetch_changes([6758], store, pages)) == []
+
+            top = texts["reportTop"].replace("ソニーグループ", "ソニー")
+            m.get("https://kabuyoho.jp/sp/reportTop?bcode=6758", text=top)
+            m.get("https://kabuyoho.jp/sp/reportTarget?bcode=6758", status_code=404)
+            changes = list(kabupy.Kabuyoho(middlewares=[]).fetch_changes([6758], store, pages))
+            assert changes == [Change("6758", "report_top.name", "ソニーグループ", "ソニー")]
+            snapshot = store.get("6758")
+            assert snapshot is not None
+            assert snapshot["report_target.name"] == "ソニーグループ"
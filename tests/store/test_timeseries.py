@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+import numpy as np
+from money import Money
+
+from kabupy.store import TimeSeriesStore
+from kabupy.store.timeseries import to_column
+
+
+def snapshot(per, name):
+    return {
+        "report_top.expected_per": per,
+        "report_top.price": Money("100", "JPY"),
+        "report_top.name": name,
+        "report_top.earnings_release_date": datetime(2023, 11, 1),
+        "report_top.news_links": [{"title": "foo"}],
+    }
+
+
+class TestTimeSeriesStore:
+    def test_append_and_query(self, tmp_path):
+        store = TimeSeriesStore(tmp_path)
+        store.append(date(2023, 9, 1), {"6758": snapshot(12.5, "A"), "7837": snapshot(None, "B")})
+        store.append(date(2023, 9, 2), {"6758": snapshot(13.0, "A"), "1301": snapshot(8.0, None)})
+        store.append(date(2023, 9, 3), {})
+        assert store.days() == [date(2023, 9, 1), date(2023, 9, 2), date(2023, 9, 3)]
+        assert "report_top.news_links" not in store.fields(date(2023, 9, 1))
+
+        frame = store.query(
+            ["report_top.expected_per", "report_top.name"], [6758, "7837", "9999"], end=date(2023, 9, 2)
+        )
+        assert frame["security_code"].tolist() == ["6758", "7837", "6758"]
+        assert frame["date"].tolist() == [datetime(2023, 9, 1), datetime(2023, 9, 1), datetime(2023, 9, 2)]
+        assert np.allclose(frame["report_top.expected_per"], [12.5, np.nan, 13.0], equal_nan=True)
+        assert frame["report_top.name"].tolist() == ["A", "B", "A"]
+
+        frame = store.query(["report_top.price", "report_top.foo"], start=date(2023, 9, 2))
+        assert frame["security_code"].tolist() == ["1301", "6758"]
+        assert frame["report_top.price"].tolist() == [100.0, 100.0]
+        assert frame["report_top.foo"].isna().to_numpy().all()
+
+    def test_frame_and_replace(self, tmp_path):
+        store = TimeSeriesStore(tmp_path)
+        store.append(date(2023, 9, 1), {"6758": snapshot(12.5, "A")})
+        store.append(date(2023, 9, 1), {"6758": snapshot(14.0, "A"), "7837": snapshot(9.0, "B")})
+        frame = store.frame(date(2023, 9, 1))
+        assert frame.index.tolist() == ["6758", "7837"]
+        assert frame["report_top.expected_per"].tolist() == [14.0, 9.0]
+        assert frame["report_top.earnings_release_date"].iloc[0] == datetime(2023, 11, 1)
+        assert store.days() == [date(2023, 9, 1)]
+
+    def test_bools(self, tmp_path):
+        column = to_column([True, None, False])
+        assert column is not None
+        assert np.allclose(column, [1.0, np.nan, 0.0], equal_nan=True)
+        store = TimeSeriesStore(tmp_path)
+        store.append(date(2023, 9, 1), {"6758": {"report_news.has_links": True}, "7837": {}})
+        frame = store.query(["report_news.has_links"])
+        assert np.allclose(frame["report_news.has_links"], [1.0, np.nan], equal_nan=True)
@@ -0,0 +1,74 @@
+import os
+import threading
+from unittest import mock
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.base import Webpage
+from kabupy.errors import ElementNotFoundError
+from kabupy.kabuyoho.report_top import ReportTop
+from kabupy.store import ValueStore
+
+
+@pytest.fixture
+def text(helpers):
+    return helpers.html2text(
+        filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), "../kabuyoho/html/reportTop/6758.html")
+    )
+
+
+class TestValueStore:
+    def test_get_put(self, tmp_path):
+        with ValueStore(tmp_path / "values.sqlite") as store:
+            assert store.get("ReportTop", "abc") is None
+            store.put("ReportTop", "abc", {"price": 1, "error": lambda: None})
+            assert store.get("ReportTop", "abc") == {"price": 1}
+            assert len(store) == 1
+        with ValueStore(tmp_path / "values.sqlite", version="2") as store:
+            assert store.get("ReportTop", "abc") is None
+            assert store.purge() == 1
+            assert len(store) == 0
+
+    def test_skip_parse(self, tmp_path, text):
+        with ValueStore(tmp_path / "values.sqlite") as store:
+            website = kabupy.Kabuyoho(value_store=store)
+            with requests_mock.Mocker() as m:
+                m.get("https://kabuyoho.jp/sp/reportTop?bcode=6758", text=text)
+                m.get("https://kabuyoho.jp/sp/reportTop?bcode=7837", text="<html></html>")
+                expected = website.stock(6758).report_top.extract()
+                website.stock(7837).report_top.extract()
+                assert len(store) == 2
+                with mock.patch.object(Webpage, "parse", wraps=Webpage.parse) as parse:
+                    page = website.stock(6758).report_top
+                    empty = website.stock(7837).report_top
+                    assert parse.call_count == 0
+                    assert {name: getattr(page, name) for name in ReportTop.webpage_properties()} == expected
+                    assert parse.call_count == 0
+                    with pytest.raises(ElementNotFoundError):
+                        empty.price
+                    assert parse.call_count == 0
+                    assert page.select_one("main") is not None
+                    assert parse.call_count == 1
+
+    def test_store_once_per_flight(self, tmp_path, text, fake_transport):
+        transport = fake_transport(content=text.encode("utf-8"), delay=0.1)
+        with ValueStore(tmp_path / "values.sqlite") as store:
+            website = kabupy.Kabuyoho(transport=transport, middlewares=[], value_store=store)
+            pages = []
+            with mock.patch.object(
+                ReportTop, "extract", autospec=True, side_effect=Webpage.extract
+            ) as extract, mock.patch.object(store, "put", wraps=store.put) as put:
+                threads = [
+                    threading.Thread(target=lambda: pages.append(website.stock(6758).report_top)) for _ in range(4)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            assert len(transport.requests) == 1
+            assert extract.call_count == 1
+            assert put.call_count == 1
+            assert len(pages) == 4
+            assert all(page.values == pages[0].values for page in pages)
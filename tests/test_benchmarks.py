@@ -0,0 +1,63 @@
+import argparse
+import importlib.util
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+import kabupy
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "benchmarks")
+
+
+def load(name: str):
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(BENCHMARKS, f"{name}.py"))
+        assert spec is not None and spec.loader is not None
+        module = sys.modules[name] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+@pytest.fixture
+def server():
+    with load("stub_server").StubServer(port=0, news_pages=2) as stub:
+        yield stub
+
+
+def get(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as ex:
+        return ex.code
+
+
+class TestBenchmarks:
+    def test_stub_server(self, server):
+        stub_server = load("stub_server")
+        paths = [f"{path}?bcode=1234" for path in stub_server.REPORTS]
+        paths += [f"/sp/reportNews?bcode=1234&cat={cat}" for cat in stub_server.NEWS_CATEGORIES]
+        paths += [stub_server.JPX_PAGE, stub_server.JPX_XLS]
+        assert [get(server.url + path) for path in paths] == [200] * len(paths)
+        assert get(server.url + "/foo") == 404
+
+    def test_news_pages(self, server):
+        page = kabupy.Kabuyoho(url=server.url).stock(1234).report_news.market_report
+        assert page.get_max_page() == 2
+        first = page.get_links(max_page=1, time_sleep=0)
+        assert len(page.get_links(max_page=None, time_sleep=0)) == 2 * len(first)
+        with urllib.request.urlopen(f"{server.url}/sp/reportNews?bcode=1234&cat=1&page=3", timeout=10) as response:
+            assert "該当するニュースがございません" in response.read().decode("utf-8")
+
+    def test_load_test(self, server):
+        args = argparse.Namespace(codes=2, news_codes=1, workers=2, max_limit=2, retries=0)
+        result = load("load_test").run(server.url, args)
+        assert result["fetch_pages"]["pages"] == 8
+        assert result["fetch_pages"]["errors"] == 0
+        assert result["report_news"]["errors"] == 0
+        assert result["report_news"]["statuses"] == {"200": 8}  # 4 categories of 2 pages
+        assert result["jpx_issues"]["errors"] == 0
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src")
+
+
+def run(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True).stdout
+
+
+class TestLazyImport:
+    def test_import_kabupy(self):
+        code = (
+            "import sys, kabupy; print(sorted(m for m in ('bs4', 'money', 'pandas', 'requests') if m in sys.modules))"
+        )
+        assert run(code).strip() == "[]"
+
+    def test_kabuyoho_without_pandas(self):
+        code = "import sys, kabupy; kabupy.kabuyoho; print('pandas' in sys.modules)"
+        assert run(code).strip() == "False"
+
+    def test_public_names(self):
+        code = (
+            "import kabupy\n"
+            "from kabupy.kabuyoho import screen\n"
+            "print(type(kabupy.kabuyoho).__name__, type(kabupy.jpx).__name__, kabupy.Kabuyoho.__name__,"
+            " kabupy.kabuyoho is kabupy.kabuyoho, 'jpx' in dir(kabupy))"
+        )
+        assert run(code).split() == ["Kabuyoho", "Jpx", "Kabuyoho", "True", "True"]
@@ -0,0 +1,126 @@
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+import kabupy
+from kabupy.exceptions import CircuitOpenError
+from kabupy.transport import CircuitBreakerMiddleware, MetricsMiddleware, RetryMiddleware, parse_retry_after
+from kabupy.util.metrics import MetricsRegistry
+
+
+class TestRetry:
+    def test_default_middlewares(self):
+        website = kabupy.Kabuyoho()
+        assert [type(m) for m in website.middlewares] == [
+            RetryMiddleware,
+            CircuitBreakerMiddleware,
+            MetricsMiddleware,
+        ]
+        assert kabupy.Kabuyoho(middlewares=[]).middlewares == []
+
+    def test_backoff(self):
+        retry = RetryMiddleware(backoff=1, max_delay=3, seed=0)
+        for attempt, ceiling in [(0, 1), (1, 2), (2, 3), (5, 3)]:
+            assert 0 <= retry.delay(attempt) <= ceiling
+
+    def test_retry_after(self, fake_transport):
+        transport = fake_transport([429, 200], headers={"Retry-After": "0"})
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[RetryMiddleware(backoff=100)])
+        assert website.fetch("https://example.com/").status_code == 200
+        assert len(transport.requests) == 2
+
+    def test_retry_after_too_long(self, fake_transport):
+        transport = fake_transport([429, 200], headers={"Retry-After": "120"})
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[RetryMiddleware(max_delay=30)])
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://example.com/")
+        assert len(transport.requests) == 1
+
+    def test_retry_connection_errors(self, fake_transport):
+        transport = fake_transport(
+            [requests.ConnectionError(), requests.Timeout(), requests.exceptions.ChunkedEncodingError(), 200]
+        )
+        registry = MetricsRegistry()
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[RetryMiddleware(backoff=0, registry=registry)])
+        assert website.fetch("https://example.com/").status_code == 200
+        assert len(transport.requests) == 4
+        retries = registry.counter("kabupy_retries_total", labels=("host", "reason"))
+        assert retries.value({"host": "example.com", "reason": "ConnectionError"}) == 1
+        assert retries.value({"host": "example.com", "reason": "Timeout"}) == 1
+        assert retries.value({"host": "example.com", "reason": "ChunkedEncodingError"}) == 1
+
+    def test_retry_connection_errors_exhausted(self, fake_transport):
+        transport = fake_transport([requests.ConnectionError()])
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[RetryMiddleware(retries=1, backoff=0)])
+        with pytest.raises(requests.ConnectionError):
+            website.fetch("https://example.com/")
+        assert len(transport.requests) == 2
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("foo") is None
+        delay = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+        assert delay is not None and 50 < delay <= 60
+
+
+class TestCircuitBreaker:
+    def test_open_and_close(self, fake_transport):
+        transport = fake_transport([503, 503, 200])
+        breaker = CircuitBreakerMiddleware(threshold=2, reset_timeout=0.05)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[breaker])
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                website.fetch("https://example.com/")
+        assert breaker.state("example.com") == "open"
+        with pytest.raises(CircuitOpenError):
+            website.fetch("https://example.com/")
+        assert len(transport.requests) == 2
+        assert website.fetch("https://example.org/").ok
+        time.sleep(0.05)
+        assert breaker.state("example.com") == "half-open"
+        assert website.fetch("https://example.com/").ok
+        assert breaker.state("example.com") == "closed"
+
+    def test_failed_probe(self, fake_transport):
+        transport = fake_transport([503])
+        breaker = CircuitBreakerMiddleware(threshold=1, reset_timeout=0.05)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[breaker])
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://example.com/")
+        time.sleep(0.05)
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://example.com/")
+        assert breaker.state("example.com") == "open"
+
+    def test_not_retried_when_open(self, fake_transport):
+        transport = fake_transport([503])
+        website = kabupy.Kabuyoho(
+            transport=transport,
+            middlewares=[RetryMiddleware(retries=5, backoff=0), CircuitBreakerMiddleware(threshold=2)],
+        )
+        with pytest.raises(CircuitOpenError):
+            website.fetch("https://example.com/")
+        assert len(transport.requests) == 2
+
+    def test_probe_raising_other_error(self, fake_transport):
+        transport = fake_transport([503, ValueError("boom"), 200])
+        breaker = CircuitBreakerMiddleware(threshold=1, reset_timeout=0)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[breaker])
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://example.com/")
+        with pytest.raises(ValueError):
+            website.fetch("https://example.com/")
+        assert breaker.state("example.com") == "half-open"
+        assert website.fetch("https://example.com/").ok
+        assert breaker.state("example.com") == "closed"
+
+    def test_connection_errors_open(self, fake_transport):
+        transport = fake_transport([requests.ConnectionError()])
+        breaker = CircuitBreakerMiddleware(threshold=1)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[breaker])
+        with pytest.raises(requests.ConnectionError):
+            website.fetch("https://example.com/")
+        assert breaker.state("example.com") == "open"
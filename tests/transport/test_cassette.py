@@ -0,0 +1,49 @@
+import os
+import time
+
+import pytest
+import requests_mock
+
+import kabupy
+from kabupy.exceptions import KabupyError
+from kabupy.transport import CassetteTransport, Response
+
+
+class TestCassetteTransport:
+    def test_record_and_replay(self, helpers, tmp_path):
+        text = helpers.html2text(
+            filename=os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "../kabuyoho/html/reportDps/6758.html",
+            )
+        )
+        website = kabupy.Kabuyoho(transport=CassetteTransport(tmp_path, mode="record"))
+        with requests_mock.Mocker() as m:
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=6758", text=text)
+            expected = website.stock(6758).report_dps.dividend_history
+        website = kabupy.Kabuyoho(transport=CassetteTransport(tmp_path, mode="replay"))
+        with requests_mock.Mocker() as m:
+            assert website.stock(6758).report_dps.dividend_history == expected
+            assert m.call_count == 0
+
+    def test_replay_latency(self, tmp_path):
+        transport = CassetteTransport(tmp_path, latency=0.05, jitter=0.01, seed=0)
+        transport.put(Response(url="https://example.com/", status_code=200, content=b"foo"))
+        start = time.perf_counter()
+        response = transport.get("https://example.com/")
+        assert response.content == b"foo"
+        assert "https://example.com/" in transport
+        assert time.perf_counter() - start < 0.04
+        website = kabupy.Kabuyoho(transport=transport)
+        start = time.perf_counter()
+        assert website.fetch("https://example.com/").content == b"foo"
+        assert time.perf_counter() - start >= 0.04
+
+    def test_replay_missing(self, tmp_path):
+        website = kabupy.Jpx(transport=CassetteTransport(tmp_path))
+        with pytest.raises(KabupyError):
+            website.issues_link
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            CassetteTransport(tmp_path, mode="foo")
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import requests
+
+import kabupy
+from kabupy.transport import AdaptiveConcurrencyMiddleware, Response, Transport
+from kabupy.util.metrics import MetricsRegistry
+
+
+class SlowTransport(Transport):
+    def __init__(self, delay: float = 0.02, status: int | None = 200):
+        self.delay = delay
+        self.status = status
+        self.inflight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def send(self, request):
+        with self._lock:
+            self.inflight += 1
+            self.peak = max(self.peak, self.inflight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.inflight -= 1
+        if self.status is None:
+            raise requests.Timeout()
+        return Response(url=request.url, status_code=self.status, content=b"")
+
+
+class TestAdaptiveConcurrency:
+    def test_increase(self):
+        limiter = AdaptiveConcurrencyMiddleware(initial=2, max_limit=3)
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(0.1)
+        assert limiter.limit == 3
+        assert limiter.snapshot()["decisions"] == {"increase": 20}
+
+    def test_hold_on_latency(self):
+        limiter = AdaptiveConcurrencyMiddleware(initial=2)
+        limiter.acquire()
+        limiter.release(0.1)
+        limit = limiter.limit
+        limiter.acquire()
+        limiter.release(1.0)
+        assert limiter.limit == limit
+        assert limiter.decisions["hold"] == 1
+
+    def test_decrease_once_per_round(self):
+        limiter = AdaptiveConcurrencyMiddleware(initial=8, decrease=0.5)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(10.0, throttled=True)
+        assert limiter.limit == 4
+        assert limiter.decisions == {"decrease": 1, "hold": 2}
+
+    def test_limit_inflight(self):
+        transport = SlowTransport()
+        limiter = AdaptiveConcurrencyMiddleware(initial=2, max_limit=2)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[limiter])
+        threads = [threading.Thread(target=website.fetch, args=(f"https://example.com/{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert transport.peak == 2
+        assert limiter.inflight == 0
+
+    def test_throttled(self):
+        limiter = AdaptiveConcurrencyMiddleware(initial=4)
+        website = kabupy.Kabuyoho(transport=SlowTransport(delay=0, status=429), middlewares=[limiter])
+        try:
+            website.fetch("https://example.com/")
+        except requests.HTTPError:
+            pass
+        assert limiter.limit == 2
+        website = kabupy.Kabuyoho(transport=SlowTransport(delay=0, status=None), middlewares=[limiter])
+        try:
+            website.fetch("https://example.com/")
+        except requests.Timeout:
+            pass
+        assert limiter.limit == 1
+
+    def test_decisions_metric(self):
+        registry = MetricsRegistry()
+        limiter = AdaptiveConcurrencyMiddleware(initial=4, registry=registry)
+        website = kabupy.Kabuyoho(transport=SlowTransport(delay=0), middlewares=[limiter])
+        website.fetch("https://example.com/")
+        website = kabupy.Kabuyoho(transport=SlowTransport(delay=0, status=429), middlewares=[limiter])
+        try:
+            website.fetch("https://example.com/")
+        except requests.HTTPError:
+            pass
+        decisions = registry.counter("kabupy_concurrency_decisions_total", labels=("decision",))
+        assert decisions.value({"decision": "increase"}) == 1
+        assert decisions.value({"decision": "decrease"}) == 1
+        assert 'kabupy_concurrency_decisions_total{decision="increase"} 1' in registry.export()
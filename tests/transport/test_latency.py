@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, wait
+
+import pytest
+import requests
+
+import kabupy
+from kabupy.transport import (
+    AdaptiveTimeoutMiddleware,
+    HedgingMiddleware,
+    LatencyTracker,
+    RateLimitMiddleware,
+    Response,
+    Transport,
+    latency,
+)
+
+
+def wait_for_all(futures, timeout=None, return_when=ALL_COMPLETED):
+    """wait of the hedging middleware, returning only once all futures are done, the failed ones first."""
+    done, pending = wait(futures, timeout, ALL_COMPLETED if timeout is None else return_when)
+    return sorted(done, key=lambda future: future.exception() is None), pending
+
+
+class StragglerTransport(Transport):
+    """The first request of every url is slow, the others are fast."""
+
+    def __init__(self, slow=0.5, fast=0.01):
+        self.slow = slow
+        self.fast = fast
+        self.timeouts = []
+        self.seen = set()
+        self._lock = threading.Lock()
+
+    def send(self, request):
+        with self._lock:
+            self.timeouts.append(request.timeout)
+            first = request.url not in self.seen
+            self.seen.add(request.url)
+        time.sleep(self.slow if first else self.fast)
+        return Response(url=request.url, status_code=200, content=b"slow" if first else b"fast")
+
+
+class TestLatency:
+    def test_tracker(self):
+        tracker = LatencyTracker(window=10)
+        for i in range(20):
+            tracker.observe(f"https://kabuyoho.jp/sp/reportTop?bcode={i}", i / 100)
+        assert tracker.count("https://kabuyoho.jp/sp/reportTop?bcode=1") == 10
+        assert tracker.percentile("https://kabuyoho.jp/sp/reportTop", 0.5) == 0.15
+        assert tracker.percentile("https://kabuyoho.jp/sp/reportDps", 0.5) is None
+
+    def test_adaptive_timeout(self):
+        tracker = LatencyTracker()
+        timeout = AdaptiveTimeoutMiddleware(
+            multiplier=3, min_timeout=0.1, max_timeout=10, min_samples=2, tracker=tracker
+        )
+        assert timeout.timeout("https://kabuyoho.jp/sp/reportTop") == 10
+        tracker.observe("https://kabuyoho.jp/sp/reportTop", 0.2)
+        tracker.observe("https://kabuyoho.jp/sp/reportTop", 0.5)
+        assert timeout.timeout("https://kabuyoho.jp/sp/reportTop") == 1.5
+        tracker.observe("https://kabuyoho.jp/sp/reportTop", 100)
+        assert timeout.timeout("https://kabuyoho.jp/sp/reportTop") == 10
+
+    def test_timeout_is_set(self):
+        transport = StragglerTransport(slow=0, fast=0)
+        timeout = AdaptiveTimeoutMiddleware(min_samples=1, min_timeout=2)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[timeout])
+        website.fetch("https://example.com/?a")
+        website.fetch("https://example.com/?b")
+        assert transport.timeouts == [10, 2]
+
+    def test_hedging(self):
+        transport = StragglerTransport()
+        tracker = LatencyTracker()
+        tracker.observe("https://example.com/", 0.01)
+        hedging = HedgingMiddleware(min_samples=1, tracker=tracker)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[hedging])
+        start = time.monotonic()
+        assert website.fetch("https://example.com/").content == b"fast"
+        assert time.monotonic() - start < 0.3
+        assert hedging.hedges == 1
+        assert hedging.wins == 1
+        assert website.fetch("https://example.com/").content == b"fast"
+        assert hedging.hedges == 1
+
+    @pytest.mark.parametrize("statuses", [[requests.ConnectionError(), 200], [200, requests.ConnectionError()]])
+    def test_hedging_done_together(self, fake_transport, monkeypatch, statuses):
+        monkeypatch.setattr(latency, "wait", wait_for_all)
+        tracker = LatencyTracker()
+        tracker.observe("https://example.com/", 0.01)
+        transport = fake_transport(statuses, delay=0.05)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[HedgingMiddleware(min_samples=1, tracker=tracker)])
+        assert website.fetch("https://example.com/").status_code == 200
+        assert len(transport.requests) == 2
+
+    def test_hedging_all_failed(self, fake_transport, monkeypatch):
+        monkeypatch.setattr(latency, "wait", wait_for_all)
+        tracker = LatencyTracker()
+        tracker.observe("https://example.com/", 0.01)
+        transport = fake_transport([requests.ConnectionError("primary"), requests.Timeout("hedge")], delay=0.05)
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[HedgingMiddleware(min_samples=1, tracker=tracker)])
+        with pytest.raises(requests.ConnectionError, match="primary"):
+            website.fetch("https://example.com/")
+
+    def test_hedges_are_rate_limited(self):
+        transport = StragglerTransport(slow=0.3)
+        tracker = LatencyTracker()
+        tracker.observe("https://example.com/", 0.01)
+        website = kabupy.Kabuyoho(
+            transport=transport,
+            middlewares=[HedgingMiddleware(min_samples=1, tracker=tracker), RateLimitMiddleware(interval=0.2)],
+        )
+        start = time.monotonic()
+        website.fetch("https://example.com/")
+        assert 0.2 <= time.monotonic() - start < 0.3
+        assert len(transport.timeouts) == 2
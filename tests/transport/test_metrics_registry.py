@@ -0,0 +1,41 @@
+import pytest
+import requests
+
+import kabupy
+from kabupy.transport import (
+    AdaptiveConcurrencyMiddleware,
+    CacheMiddleware,
+    MetricsMiddleware,
+    RateLimitMiddleware,
+    RetryMiddleware,
+)
+from kabupy.util.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    def test_middlewares(self, fake_transport):
+        registry = MetricsRegistry()
+        middlewares = [
+            CacheMiddleware(registry=registry),
+            RetryMiddleware(backoff=0, registry=registry),
+            RateLimitMiddleware(interval=0, registry=registry),
+            AdaptiveConcurrencyMiddleware(registry=registry),
+            MetricsMiddleware(registry=registry),
+        ]
+        website = kabupy.Kabuyoho(transport=fake_transport([503, 200, 404]), middlewares=middlewares)
+        website.fetch("https://kabuyoho.jp/sp/reportTop?bcode=6758")
+        website.fetch("https://kabuyoho.jp/sp/reportTop?bcode=6758")
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://kabuyoho.jp/sp/reportTarget?bcode=6758")
+        labels = {"host": "kabuyoho.jp", "page_type": "/sp/reportTop"}
+        assert registry.counter("kabupy_requests_total").value({**labels, "status": "503"}) == 1
+        assert registry.counter("kabupy_requests_total").value({**labels, "status": "200"}) == 1
+        assert registry.counter("kabupy_retries_total").value({"host": "kabuyoho.jp", "reason": "503"}) == 1
+        assert registry.counter("kabupy_cache_requests_total").value({"result": "hit"}) == 1
+        assert registry.counter("kabupy_cache_requests_total").value({"result": "miss"}) == 2
+        assert registry.histogram("kabupy_response_bytes").sum(labels) == 6
+        assert registry.histogram("kabupy_request_seconds").count(labels) == 2
+        assert registry.histogram("kabupy_rate_limit_wait_seconds").count({"host": "kabuyoho.jp"}) == 3
+        assert registry.gauge("kabupy_requests_in_flight").value({"host": "kabuyoho.jp"}) == 0
+        assert registry.gauge("kabupy_concurrency_in_flight").value() == 0
+        assert "kabupy_concurrency_limit" in registry.export()
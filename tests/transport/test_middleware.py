@@ -0,0 +1,96 @@
+import time
+
+import pytest
+import requests
+
+import kabupy
+from kabupy.transport import (
+    CacheMiddleware,
+    CassetteTransport,
+    MetricsMiddleware,
+    Middleware,
+    RateLimitMiddleware,
+    RecordMiddleware,
+    Request,
+    RetryMiddleware,
+)
+
+
+class Tag(Middleware):
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    def handle(self, request, call_next):
+        self.log.append(f"{self.name}>")
+        response = call_next(request)
+        self.log.append(f"<{self.name}")
+        return response
+
+
+class TestMiddleware:
+    def test_order(self, fake_transport):
+        log = []
+        website = kabupy.Kabuyoho(transport=fake_transport(), middlewares=[Tag("a", log), Tag("b", log)])
+        website.fetch("https://example.com/")
+        assert log == ["a>", "b>", "<b", "<a"]
+
+    def test_raise_for_status(self, fake_transport):
+        website = kabupy.Kabuyoho(transport=fake_transport([404]))
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://example.com/")
+
+    def test_cache(self, fake_transport):
+        transport = fake_transport()
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[CacheMiddleware(max_entries=1)])
+        website.fetch("https://example.com/a")
+        website.fetch("https://example.com/a")
+        assert len(transport.requests) == 1
+        website.fetch("https://example.com/b")
+        website.fetch("https://example.com/a")
+        assert len(transport.requests) == 3
+
+    def test_cache_ttl(self, fake_transport):
+        transport = fake_transport()
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[CacheMiddleware(ttl=0)])
+        website.fetch("https://example.com/a")
+        website.fetch("https://example.com/a")
+        assert len(transport.requests) == 2
+
+    def test_rate_limit(self, fake_transport):
+        website = kabupy.Kabuyoho(transport=fake_transport(), middlewares=[RateLimitMiddleware(interval=0.05)])
+        start = time.perf_counter()
+        for _ in range(3):
+            website.fetch("https://example.com/")
+        website.fetch("https://example.org/")
+        assert 0.1 <= time.perf_counter() - start < 0.15
+
+    def test_retry(self, fake_transport):
+        transport = fake_transport([503, 429, 200])
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[RetryMiddleware(retries=2, backoff=0)])
+        assert website.fetch("https://example.com/").status_code == 200
+        assert len(transport.requests) == 3
+
+    def test_retry_exhausted(self, fake_transport):
+        transport = fake_transport([503])
+        website = kabupy.Kabuyoho(transport=transport, middlewares=[RetryMiddleware(retries=1, backoff=0)])
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://example.com/")
+        assert len(transport.requests) == 2
+
+    def test_metrics(self, fake_transport):
+        metrics = MetricsMiddleware()
+        website = kabupy.Kabuyoho(transport=fake_transport([200, 404]), middlewares=[metrics])
+        website.fetch("https://example.com/")
+        with pytest.raises(requests.HTTPError):
+            website.fetch("https://example.com/")
+        snapshot = metrics.snapshot()
+        assert snapshot["requests"] == 2
+        assert snapshot["statuses"] == {200: 1, 404: 1}
+        assert snapshot["bytes"] == 6
+
+    def test_record(self, tmp_path, fake_transport):
+        cassette = CassetteTransport(tmp_path)
+        website = kabupy.Kabuyoho(transport=fake_transport(), middlewares=[RecordMiddleware(cassette)])
+        website.fetch("https://example.com/")
+        assert cassette.send(Request("https://example.com/")).content == b"foo"
@@ -0,0 +1,49 @@
+import time
+
+from kabupy.util.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_max_entries(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_max_bytes(self):
+        cache = LRUCache(max_bytes=10, sizeof=len)
+        cache.put("a", [0] * 4)
+        cache.put("b", [0] * 4)
+        assert cache.nbytes == 8
+        cache.get("b").extend([0] * 4)
+        cache.resize("b")
+        assert "a" not in cache
+        assert cache.nbytes == 8
+        cache.put("c", [0] * 11)
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=0.05)
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        time.sleep(0.05)
+        assert cache.get("a") is None
+        assert cache.setdefault("a", lambda: 2) == 2
+        assert cache.setdefault("a", lambda: 3) == 2
+
+    def test_pop_and_clear(self):
+        cache = LRUCache(sizeof=lambda value: 1)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        assert cache.nbytes == 1
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.nbytes == 0
@@ -0,0 +1,57 @@
+import pytest
+
+from kabupy.util.metrics import MetricsRegistry, Sample
+
+
+class TestMetricsRegistry:
+    def test_export(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("host",))
+        requests.inc({"host": "kabuyoho.jp"})
+        requests.inc({"host": 'a"b'}, 2)
+        registry.gauge("in_flight", "In flight.").set(3)
+        latency = registry.histogram("seconds", "Latency.", ("host",), buckets=(0.1, 1))
+        latency.observe(0.05, {"host": "kabuyoho.jp"})
+        latency.observe(0.5, {"host": "kabuyoho.jp"})
+        latency.observe(5, {"host": "kabuyoho.jp"})
+        assert registry.export().splitlines() == [
+            "# HELP in_flight In flight.",
+            "# TYPE in_flight gauge",
+            "in_flight 3",
+            "# HELP requests_total Requests.",
+            "# TYPE requests_total counter",
+            'requests_total{host="kabuyoho.jp"} 1',
+            'requests_total{host="a\\"b"} 2',
+            "# HELP seconds Latency.",
+            "# TYPE seconds histogram",
+            'seconds_bucket{host="kabuyoho.jp",le="0.1"} 1',
+            'seconds_bucket{host="kabuyoho.jp",le="1.0"} 2',
+            'seconds_bucket{host="kabuyoho.jp",le="+Inf"} 3',
+            'seconds_sum{host="kabuyoho.jp"} 5.55',
+            'seconds_count{host="kabuyoho.jp"} 3',
+        ]
+        assert latency.count({"host": "kabuyoho.jp"}) == 3
+        assert registry.counter("requests_total", labels=("host",)) is requests
+
+    def test_errors(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", labels=("host",))
+        with pytest.raises(ValueError):
+            counter.inc({"status": "200"})
+        with pytest.raises(ValueError):
+            registry.gauge("requests_total")
+
+    def test_label_named_amount(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("deposits_total", labels=("amount",))
+        counter.inc({"amount": "100"}, 2)
+        assert counter.value({"amount": "100"}) == 2
+
+    def test_subscribe(self):
+        registry = MetricsRegistry()
+        samples = []
+        registry.subscribe(samples.append)
+        registry.counter("requests_total", labels=("host",)).inc({"host": "jpx.co.jp"})
+        registry.histogram("seconds").observe(0.2)
+        assert samples == [Sample("requests_total", {"host": "jpx.co.jp"}, 1), Sample("seconds", {}, 0.2)]
+        assert Sample("requests_total", {"host": "jpx.co.jp"}, 1) in registry.collect()
@@ -0,0 +1,48 @@
+import json
+import os
+
+import requests_mock
+
+import kabupy
+from kabupy.transport import RateLimitMiddleware
+from kabupy.util import tracing
+
+
+class TestTracing:
+    def test_span_without_tracer(self):
+        assert tracing.current() is None
+        with tracing.span("parse"):
+            pass
+
+    def test_fetch_pages(self, helpers, tmp_path):
+        text = helpers.html2text(
+            filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), "../kabuyoho/html/reportDps/6758.html")
+        )
+        kabuyoho = kabupy.Kabuyoho(middlewares=[RateLimitMiddleware(interval=0.01)], release_soup=True)
+        with requests_mock.Mocker() as m, tracing.trace() as tracer:
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=6758", text=text)
+            m.get("https://kabuyoho.jp/sp/reportDps?bcode=7837", text=text)
+            results = list(kabuyoho.fetch_pages([6758, 7837], pages=["report_dps"], max_workers=2))
+        assert tracing.current() is None
+        assert all(result.error is None for result in results)
+        names = [event["name"] for event in tracer.events]
+        for name in ["queue", "load", "connect", "download", "parse", "extract"]:
+            assert names.count(name) == 2, name
+        rate_limits = [event for event in tracer.events if event["name"] == "rate_limit"]
+        assert len(rate_limits) <= 1
+        assert all(event["args"] == {"host": "kabuyoho.jp"} for event in rate_limits)
+        loads = {event["args"]["code"] for event in tracer.events if event["name"] == "load"}
+        assert loads == {"6758", "7837"}
+        tracer.dump(tmp_path / "trace.json")
+        with open(tmp_path / "trace.json", encoding="utf-8") as f:
+            trace = json.load(f)
+        assert {event["ph"] for event in trace["traceEvents"]} == {"M", "X"}
+        assert all(event["dur"] >= 0 for event in trace["traceEvents"] if event["ph"] == "X")
+
+    def test_rate_limit(self):
+        limiter = RateLimitMiddleware(interval=0.01)
+        with tracing.trace() as tracer:
+            delays = [limiter.wait("kabuyoho.jp") for _ in range(3)]
+        spans = [event for event in tracer.events if event["name"] == "rate_limit"]
+        assert len(spans) == sum(delay > 0 for delay in delays)
+        assert delays[0] <= 0